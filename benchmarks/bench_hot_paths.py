@@ -0,0 +1,304 @@
+"""Micro-benchmarks for the integration's in-memory hot paths.
+
+Runs the label dedupe, select ``options`` properties, the playback sensor
+attributes, the media player property chain and the Spotify response
+parsers against synthetic libraries, and reports time per call and peak
+allocation for each.
+
+Needs the same environment as the integration (Home Assistant installed):
+
+    python benchmarks/bench_hot_paths.py
+    python benchmarks/bench_hot_paths.py --save benchmarks/baseline.json
+    python benchmarks/bench_hot_paths.py --compare benchmarks/baseline.json
+
+``--compare`` exits non-zero when a case is slower (or allocates more) than
+the baseline by more than ``--threshold``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import random
+import sys
+import timeit
+import tracemalloc
+from collections.abc import Callable
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from custom_components.spotify_playlist_select.api import (  # noqa: E402
+    SpotifyDevice,
+    SpotifyPlaylist,
+    SpotifyRecentItem,
+    SpotifyTrack,
+    _decode,
+    _parse_player,
+    _parse_track_page,
+)
+from custom_components.spotify_playlist_select.artwork import ArtworkCache  # noqa: E402
+from custom_components.spotify_playlist_select.const import DOMAIN  # noqa: E402
+from custom_components.spotify_playlist_select.coordinator import SpotifyData  # noqa: E402
+from custom_components.spotify_playlist_select.media_player import (  # noqa: E402
+    SpotifyPlaylistMediaPlayer,
+)
+from custom_components.spotify_playlist_select.select import (  # noqa: E402
+    SpotifyAllPlaylistsSelect,
+    SpotifyLikedSongsSelect,
+    SpotifyPlaylistTrackSelect,
+    SpotifyRecentlyPlayedSelect,
+    _dedupe_label,
+)
+from custom_components.spotify_playlist_select.sensor import SpotifyPlaybackSensor  # noqa: E402
+from custom_components.spotify_playlist_select.volume import VolumeController  # noqa: E402
+
+ENTRY_ID = "bench"
+DEFAULT_SIZES = (1_000, 10_000, 50_000)
+
+MEDIA_PLAYER_PROPERTIES = (
+    "state",
+    "media_title",
+    "media_artist",
+    "media_album_name",
+    "media_image_url",
+    "media_content_type",
+    "media_duration",
+    "media_position",
+    "media_position_updated_at",
+    "shuffle",
+    "repeat",
+    "source",
+    "source_list",
+    "sound_mode",
+    "sound_mode_list",
+    "volume_level",
+)
+
+
+def _uri(kind: str, i: int) -> str:
+    return f"spotify:{kind}:{i:022d}"
+
+
+def make_tracks(n: int, dup_group: int, rng: random.Random) -> list[SpotifyTrack]:
+    # Names and artists are drawn from small pools so that on average
+    # dup_group tracks share the same "name — artists" label.
+    names = [f"Track {i}" for i in range(max(1, n // dup_group))]
+    artists = [f"Artist {i}" for i in range(8)]
+    return [
+        SpotifyTrack(uri=_uri("track", i), name=rng.choice(names), artists=artists[i % len(artists)])
+        for i in range(n)
+    ]
+
+
+def make_raw_page(tracks: list[SpotifyTrack]) -> dict[str, Any]:
+    return {
+        "items": [
+            {
+                "added_at": "2024-01-01T00:00:00Z",
+                "track": {
+                    "uri": t.uri,
+                    "name": t.name,
+                    "type": "track",
+                    "duration_ms": 200_000,
+                    "artists": [{"name": a} for a in t.artists.split(", ")],
+                    "album": {
+                        "name": "Album",
+                        "uri": _uri("album", 1),
+                        "images": [{"url": "https://i.scdn.co/image/x", "width": 640, "height": 640}],
+                    },
+                },
+            }
+            for t in tracks
+        ],
+        "next": None,
+        "total": len(tracks),
+    }
+
+
+def make_raw_player() -> dict[str, Any]:
+    return {
+        "is_playing": True,
+        "shuffle_state": False,
+        "repeat_state": "context",
+        "progress_ms": 42_000,
+        "timestamp": 1_700_000_000_000,
+        "item": make_raw_page([SpotifyTrack(_uri("track", 0), "Now", "Artist 0")])["items"][0]["track"],
+        "context": {"type": "playlist", "uri": "spotify:playlist:0"},
+        "device": {"id": "dev0", "name": "Speaker", "type": "Speaker", "volume_percent": 50},
+    }
+
+
+def make_fixture(n: int, dup_group: int, seed: int) -> SimpleNamespace:
+    rng = random.Random(seed)
+    tracks = make_tracks(n, dup_group, rng)
+    playlists = [SpotifyPlaylist(id=str(i), name=f"Playlist {i % max(1, n // dup_group)}") for i in range(n)]
+    recent = [
+        SpotifyRecentItem(uri=t.uri, name=t.name, artists=t.artists, played_at="2024-01-01T00:00:00Z")
+        for t in tracks
+    ]
+    devices = [SpotifyDevice(id=f"dev{i}", name=f"Speaker {i}", is_active=i == 0) for i in range(10)]
+    player = _parse_player(make_raw_player())
+
+    data = SpotifyData(
+        devices=devices,
+        playlists=playlists,
+        saved_tracks=tracks,
+        recent_tracks=recent,
+        playlist_tracks={"0": tracks},
+        player=player,
+    )
+    coordinator = SimpleNamespace(
+        data=data,
+        liked_songs=tracks,
+        upcoming=None,
+        last_update_success=True,
+        api=None,
+        playlists_for_track=lambda uri: playlists[:3],
+    )
+    entry = SimpleNamespace(entry_id=ENTRY_ID, options={}, data={})
+    artwork = ArtworkCache(None, None, "", max_disk_bytes=0, max_memory_bytes=0)
+    hass = SimpleNamespace(
+        data={
+            DOMAIN: {
+                ENTRY_ID: {
+                    "artwork": artwork,
+                    "scheduler": SimpleNamespace(pending=None, last_result=None),
+                    "selected_device_id": "dev0",
+                }
+            }
+        }
+    )
+    hass.data[DOMAIN][ENTRY_ID]["volume"] = VolumeController(hass, coordinator)
+    raw_page = make_raw_page(tracks)
+    return SimpleNamespace(
+        tracks=tracks,
+        coordinator=coordinator,
+        entry=entry,
+        hass=hass,
+        raw_page=raw_page,
+        raw_page_bytes=json.dumps(raw_page).encode(),
+        raw_player_bytes=json.dumps(make_raw_player()).encode(),
+        playlist=playlists[0],
+    )
+
+
+def build_cases(fx: SimpleNamespace) -> dict[str, Callable[[], Any]]:
+    hass, entry, coordinator = fx.hass, fx.entry, fx.coordinator
+
+    def dedupe() -> None:
+        existing: dict[str, str] = {}
+        for t in fx.tracks:
+            existing[_dedupe_label(f"{t.name} — {t.artists}", existing)] = t.uri
+
+    playlist_select = SpotifyPlaylistTrackSelect(hass, entry, coordinator, fx.playlist)
+    liked_select = SpotifyLikedSongsSelect(hass, entry, coordinator)
+    recent_select = SpotifyRecentlyPlayedSelect(hass, entry, coordinator)
+    all_playlists_select = SpotifyAllPlaylistsSelect(hass, entry, coordinator)
+    sensor = SpotifyPlaybackSensor(hass, entry, coordinator)
+    media_player = SpotifyPlaylistMediaPlayer(hass, entry, coordinator)
+
+    def media_player_chain() -> None:
+        for name in MEDIA_PLAYER_PROPERTIES:
+            getattr(media_player, name)
+
+    return {
+        "dedupe_label": dedupe,
+        "playlist_track_select.options": lambda: playlist_select.options,
+        "liked_songs_select.options": lambda: liked_select.options,
+        "recently_played_select.options": lambda: recent_select.options,
+        "all_playlists_select.options": lambda: all_playlists_select.options,
+        "playback_sensor.extra_state_attributes": lambda: sensor.extra_state_attributes,
+        "media_player.properties": media_player_chain,
+        "api.parse_track_page": lambda: _parse_track_page(fx.raw_page),
+        "api.decode_track_page": lambda: _decode(fx.raw_page_bytes, _parse_track_page),
+        "api.decode_player": lambda: _decode(fx.raw_player_bytes, _parse_player),
+    }
+
+
+def measure(func: Callable[[], Any], repeat: int) -> dict[str, float]:
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    best = min(timer.repeat(repeat=repeat, number=number)) / number
+
+    tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {"seconds": best, "peak_bytes": peak}
+
+
+def run(sizes: list[int], dup_group: int, repeat: int, seed: int, only: str | None) -> dict[str, dict[str, float]]:
+    results: dict[str, dict[str, float]] = {}
+    for n in sizes:
+        fx = make_fixture(n, dup_group, seed)
+        for name, func in build_cases(fx).items():
+            if only and only not in name:
+                continue
+            key = f"{name}[n={n}]"
+            results[key] = measure(func, repeat)
+            r = results[key]
+            print(f"{key:55s} {r['seconds'] * 1e3:10.3f} ms  {r['peak_bytes'] / 1024:10.1f} KiB")
+    return results
+
+
+def compare(results: dict[str, dict[str, float]], baseline: dict[str, Any], threshold: float) -> int:
+    regressions = 0
+    print()
+    for key, r in results.items():
+        base = baseline["results"].get(key)
+        if base is None:
+            continue
+        t_ratio = r["seconds"] / base["seconds"] if base["seconds"] else 1.0
+        m_ratio = r["peak_bytes"] / base["peak_bytes"] if base["peak_bytes"] else 1.0
+        flag = ""
+        if t_ratio > threshold or m_ratio > threshold:
+            flag = "  REGRESSION"
+            regressions += 1
+        print(f"{key:55s} time x{t_ratio:5.2f}  peak x{m_ratio:5.2f}{flag}")
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES))
+    parser.add_argument("--dup-group", type=int, default=50, help="average tracks per duplicate label")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--only", help="run cases whose name contains this string")
+    parser.add_argument("--save", type=Path, help="write results as a baseline file")
+    parser.add_argument("--compare", type=Path, help="compare against a baseline file")
+    parser.add_argument("--threshold", type=float, default=1.15, help="allowed slowdown ratio")
+    args = parser.parse_args()
+
+    results = run(args.sizes, args.dup_group, args.repeat, args.seed, args.only)
+
+    if args.save:
+        args.save.write_text(
+            json.dumps(
+                {
+                    "python": platform.python_version(),
+                    "machine": platform.machine(),
+                    "args": {"dup_group": args.dup_group, "seed": args.seed},
+                    "results": results,
+                },
+                indent=2,
+            )
+            + "\n"
+        )
+
+    if args.compare:
+        baseline = json.loads(args.compare.read_text())
+        return 1 if compare(results, baseline, args.threshold) else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
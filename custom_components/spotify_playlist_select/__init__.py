@@ -1,22 +1,71 @@
 from __future__ import annotations
 
+import os
+import shutil
+from functools import partial
+from typing import Any
+
+import aiohttp
+
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.const import EVENT_HOMEASSISTANT_CLOSE
+from homeassistant.core import Event, HomeAssistant
+from homeassistant.exceptions import ConfigEntryAuthFailed, ConfigEntryNotReady
 from homeassistant.helpers import config_entry_oauth2_flow
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
-
-from .api import SpotifyApi
-from .const import DOMAIN, PLATFORMS
+from homeassistant.helpers.storage import STORAGE_DIR
+from homeassistant.util.ssl import get_default_context
+
+from .api import DEFAULT_REQUEST_TIMEOUT, SpotifyApi, create_session
+from .artwork import ArtworkCache, SpotifyArtworkView
+from .const import (
+    ARTWORK_DISK_CACHE_BYTES,
+    ARTWORK_MEMORY_CACHE_BYTES,
+    CONF_ARTWORK_THUMBNAIL_SIZE,
+    CONF_REQUEST_TIMEOUT,
+    CONF_SYNC_ALL_LIKED_SONGS,
+    CONF_TRACING,
+    DOMAIN,
+    PLATFORMS,
+)
 from .coordinator import SpotifyCoordinator
+from .scheduler import PlaybackScheduler
 from .services import async_setup_services
+from .volume import VolumeController
+from .trace import Tracer
 
 
 SERVICES_SETUP = "services_setup"
+VIEWS_SETUP = "views_setup"
 
 async def _update_listener(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    # Token refreshes also update the entry; only option changes need a reload.
+    rt = hass.data.get(DOMAIN, {}).get(entry.entry_id)
+    if rt is not None and rt.get("options") == dict(entry.options):
+        return
     await hass.config_entries.async_reload(entry.entry_id)
 
 
+def _token_refresher(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    oauth: config_entry_oauth2_flow.OAuth2Session,
+):
+    async def _refresh() -> dict[str, Any]:
+        token = await oauth.implementation.async_refresh_token(oauth.token)
+        hass.config_entries.async_update_entry(entry, data={**entry.data, "token": token})
+        return token
+
+    return _refresh
+
+
+def _remove_legacy_artwork_cache(path: str) -> None:
+    # Earlier versions cached artwork under .storage, which is for config
+    # data and ends up in backups.
+    if os.path.isdir(path):
+        shutil.rmtree(path, ignore_errors=True)
+
+
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     session = async_get_clientsession(hass)
 
@@ -26,27 +75,92 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 
     oauth = config_entry_oauth2_flow.OAuth2Session(hass, entry, implementation)
 
-    await oauth.async_ensure_token_valid()
-    api = SpotifyApi(session, oauth.token["access_token"])
+    try:
+        await oauth.async_ensure_token_valid()
+    except aiohttp.ClientResponseError as err:
+        if err.status in (400, 401):
+            raise ConfigEntryAuthFailed(str(err)) from err
+        raise ConfigEntryNotReady(str(err)) from err
+    except aiohttp.ClientError as err:
+        raise ConfigEntryNotReady(str(err)) from err
+
+    # Spotify API traffic gets its own pooled, keep-alive connector; the
+    # shared HA session is still used for artwork downloads from the CDN.
+    api_session = create_session(get_default_context())
+    entry.async_on_unload(api_session.close)
+
+    # Unload callbacks do not run when Home Assistant stops.
+    async def _close_session(_event: Event) -> None:
+        await api_session.close()
+
+    entry.async_on_unload(
+        hass.bus.async_listen_once(EVENT_HOMEASSISTANT_CLOSE, _close_session)
+    )
+
+    api = SpotifyApi(
+        api_session,
+        oauth.token["access_token"],
+        expires_at=oauth.token.get("expires_at"),
+        token_refresher=_token_refresher(hass, entry, oauth),
+        request_timeout=float(entry.options.get(CONF_REQUEST_TIMEOUT) or DEFAULT_REQUEST_TIMEOUT),
+        tracer=Tracer(enabled=bool(entry.options.get(CONF_TRACING))),
+    )
+    entry.async_on_unload(api.async_close)
 
-    coordinator = SpotifyCoordinator(hass, api, oauth)
+    coordinator = SpotifyCoordinator(
+        hass, api, full_liked_songs=bool(entry.options.get(CONF_SYNC_ALL_LIKED_SONGS))
+    )
     await coordinator.async_config_entry_first_refresh()
 
+    artwork = ArtworkCache(
+        hass,
+        session,
+        hass.config.path(".cache", DOMAIN, "artwork"),
+        max_disk_bytes=ARTWORK_DISK_CACHE_BYTES,
+        max_memory_bytes=ARTWORK_MEMORY_CACHE_BYTES,
+    )
+    await hass.async_add_executor_job(
+        _remove_legacy_artwork_cache, hass.config.path(STORAGE_DIR, DOMAIN, "artwork")
+    )
+    await artwork.async_setup()
+    coordinator.artwork_prefetch = partial(
+        artwork.async_prefetch,
+        size=int(entry.options.get(CONF_ARTWORK_THUMBNAIL_SIZE) or 0) or None,
+    )
+
+    scheduler = PlaybackScheduler(hass, coordinator)
+    entry.async_on_unload(scheduler.async_cancel)
+
+    volume = VolumeController(hass, coordinator)
+    entry.async_on_unload(volume.async_shutdown)
+
     hass.data.setdefault(DOMAIN, {})
     hass.data[DOMAIN][entry.entry_id] = {
         "oauth": oauth,
         "api": api,
         "coordinator": coordinator,
+        "artwork": artwork,
+        "scheduler": scheduler,
+        "volume": volume,
         "selected_device_id": None,
+        "options": dict(entry.options),
     }
 
     if not hass.data[DOMAIN].get(SERVICES_SETUP):
         await async_setup_services(hass)
         hass.data[DOMAIN][SERVICES_SETUP] = True
 
+    if not hass.data[DOMAIN].get(VIEWS_SETUP):
+        hass.http.register_view(SpotifyArtworkView(hass))
+        hass.data[DOMAIN][VIEWS_SETUP] = True
+
     entry.async_on_unload(entry.add_update_listener(_update_listener))
 
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+
+    # Playlists, their tracks, Liked Songs and Recently Played arrive in the
+    # background; entities pick them up as the coordinator pushes updates.
+    coordinator.async_start_library_load()
     return True
 
 
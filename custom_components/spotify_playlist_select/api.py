@@ -1,10 +1,53 @@
 from __future__ import annotations
 
+import asyncio
+import json
+import random
+import time
+from collections import deque
+from collections.abc import AsyncIterator, Awaitable, Callable
 from dataclasses import dataclass
 from typing import Any
 
 import aiohttp
 
+from .trace import Tracer
+
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    json_loads = json.loads
+
+TOKEN_REFRESH_MARGIN = 300
+TOKEN_MIN_VALIDITY = 30
+
+SPOTIFY_API_BASE = "https://api.spotify.com"
+
+PLAY_URIS_LIMIT = 100
+# URIs past the play window are queued with one request each, in order;
+# longer lists are rejected rather than spending minutes on the queue.
+PLAY_URIS_QUEUE_LIMIT = 100
+PAGE_FETCH_CONCURRENCY = 4
+
+DEFAULT_REQUEST_TIMEOUT = 10.0
+CONNECTION_LIMIT_PER_HOST = 8
+# Longer than the poll interval, so regular polling keeps the socket open.
+KEEPALIVE_TIMEOUT = 75.0
+WARM_UP_IDLE = 45.0
+# Bodies larger than this are decoded (and reduced) in the executor.
+JSON_EXECUTOR_THRESHOLD = 64 * 1024
+
+CIRCUIT_FAILURE_THRESHOLD = 3
+CIRCUIT_BACKOFF_BASE = 15.0
+CIRCUIT_BACKOFF_MAX = 600.0
+
+CIRCUIT_CLOSED = "closed"
+CIRCUIT_OPEN = "open"
+CIRCUIT_HALF_OPEN = "half_open"
+
+TokenRefresher = Callable[[], Awaitable[dict[str, Any]]]
+Parser = Callable[[dict[str, Any]], Any]
+
 
 class SpotifyApiError(Exception):
     def __init__(self, status: int, body: str) -> None:
@@ -13,28 +56,106 @@ class SpotifyApiError(Exception):
         self.body = body
 
 
-
-@dataclass(frozen=True)
+class SpotifyTokenError(SpotifyApiError):
+    pass
+
+
+class SpotifyAuthError(SpotifyTokenError):
+    pass
+
+
+class SpotifyCircuitOpenError(SpotifyApiError):
+    def __init__(self, retry_in: float) -> None:
+        super().__init__(503, f"circuit open, retrying in {retry_in:.0f}s")
+        self.retry_in = retry_in
+
+
+class CircuitBreaker:
+    def __init__(
+        self,
+        threshold: int = CIRCUIT_FAILURE_THRESHOLD,
+        backoff_base: float = CIRCUIT_BACKOFF_BASE,
+        backoff_max: float = CIRCUIT_BACKOFF_MAX,
+    ) -> None:
+        self.threshold = threshold
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.state = CIRCUIT_CLOSED
+        self.failures = 0
+        self.trips = 0
+        self._open_until = 0.0
+
+    @property
+    def retry_in(self) -> float:
+        return max(0.0, self._open_until - time.monotonic())
+
+    @property
+    def probe_due(self) -> bool:
+        return self.state == CIRCUIT_OPEN and self.retry_in == 0.0
+
+    def allow_request(self) -> bool:
+        if self.state == CIRCUIT_CLOSED:
+            return True
+        if self.probe_due:
+            self.state = CIRCUIT_HALF_OPEN
+            return True
+        return False
+
+    def record_success(self) -> None:
+        self.state = CIRCUIT_CLOSED
+        self.failures = 0
+        self.trips = 0
+
+    def record_failure(self) -> None:
+        if self.state == CIRCUIT_OPEN:
+            # Late responses from requests sent before the trip must not
+            # extend the backoff.
+            return
+        self.failures += 1
+        if self.state == CIRCUIT_HALF_OPEN or self.failures >= self.threshold:
+            self._trip()
+
+    def release_probe(self) -> None:
+        if self.state == CIRCUIT_HALF_OPEN:
+            self.state = CIRCUIT_OPEN
+
+    def _trip(self) -> None:
+        self.trips += 1
+        delay = min(self.backoff_max, self.backoff_base * 2 ** (self.trips - 1))
+        delay += random.uniform(0, delay * 0.25)
+        self.state = CIRCUIT_OPEN
+        self._open_until = time.monotonic() + delay
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "state": self.state,
+            "consecutive_failures": self.failures,
+            "retry_in": round(self.retry_in, 1) if self.state == CIRCUIT_OPEN else None,
+        }
+
+
+
+@dataclass(frozen=True, slots=True)
 class SpotifyPlaylist:
     id: str
     name: str
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class SpotifyTrack:
     uri: str
     name: str
     artists: str
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class SpotifyDevice:
     id: str
     name: str
     is_active: bool
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class SpotifyRecentItem:
     uri: str
     name: str
@@ -42,16 +163,368 @@ class SpotifyRecentItem:
     played_at: str | None
 
 
+@dataclass(frozen=True, slots=True)
+class SpotifyImage:
+    url: str
+    width: int | None
+    height: int | None
+
+
+@dataclass(frozen=True, slots=True)
+class PlayerState:
+    is_playing: bool
+    shuffle_state: bool
+    repeat_state: str | None
+    progress_ms: int | None
+    timestamp: int | None
+    item_type: str | None
+    item_uri: str | None
+    item_name: str | None
+    duration_ms: int | None
+    artists: tuple[str, ...]
+    album_name: str | None
+    album_uri: str | None
+    images: tuple[SpotifyImage, ...]
+    context_type: str | None
+    context_uri: str | None
+    device_id: str | None
+    device_name: str | None
+    device_type: str | None
+    device_volume_percent: int | None
+    device_is_active: bool | None
+    device_is_restricted: bool | None
+
+    @property
+    def artist(self) -> str | None:
+        return ", ".join(self.artists) if self.artists else None
+
+    @property
+    def image_url(self) -> str | None:
+        return self.images[0].url if self.images else None
+
+
+@dataclass(frozen=True, slots=True)
+class UpcomingTrack:
+    uri: str
+    name: str | None
+    item_type: str | None
+    artists: tuple[str, ...]
+    album_name: str | None
+    album_uri: str | None
+    duration_ms: int | None
+    images: tuple[SpotifyImage, ...]
+
+    @property
+    def artist(self) -> str | None:
+        return ", ".join(self.artists) if self.artists else None
+
+    @property
+    def image_url(self) -> str | None:
+        return self.images[0].url if self.images else None
+
+
+def _parse_images(images: list[dict[str, Any]] | None) -> tuple[SpotifyImage, ...]:
+    return tuple(
+        SpotifyImage(url=img["url"], width=img.get("width"), height=img.get("height"))
+        for img in (images or [])
+        if img.get("url")
+    )
+
+
+def _decode(raw: bytes, parse: Parser | None) -> Any:
+    data = json_loads(raw) if raw else {}
+    return parse(data) if parse else data
+
+
+def _parse_track(t: dict[str, Any] | None) -> SpotifyTrack | None:
+    t = t or {}
+    uri = t.get("uri")
+    if not uri:
+        return None
+    name = t.get("name", "Unknown")
+    artists = ", ".join(a.get("name", "") for a in (t.get("artists") or [])) or "Unknown"
+    return SpotifyTrack(uri=uri, name=name, artists=artists)
+
+
+def _parse_track_page(data: dict[str, Any]) -> dict[str, Any]:
+    tracks: list[SpotifyTrack] = []
+    for item in data.get("items", []):
+        track = _parse_track((item or {}).get("track"))
+        if track:
+            tracks.append(track)
+    return {"tracks": tracks, "next": data.get("next"), "total": int(data.get("total") or 0)}
+
+
+def _parse_playlist_page(data: dict[str, Any]) -> dict[str, Any]:
+    playlists = [
+        SpotifyPlaylist(id=it["id"], name=it["name"])
+        for it in data.get("items", [])
+        if it and it.get("id")
+    ]
+    return {"playlists": playlists, "next": data.get("next"), "total": int(data.get("total") or 0)}
+
+
+def _parse_player(data: dict[str, Any]) -> PlayerState | None:
+    if not data:
+        return None
+
+    item = data.get("item") or {}
+    album = item.get("album") or {}
+    ctx = data.get("context") or {}
+    dev = data.get("device") or {}
+
+    return PlayerState(
+        is_playing=bool(data.get("is_playing")),
+        shuffle_state=bool(data.get("shuffle_state")),
+        repeat_state=data.get("repeat_state"),
+        progress_ms=data.get("progress_ms"),
+        timestamp=data.get("timestamp"),
+        item_type=item.get("type"),
+        item_uri=item.get("uri"),
+        item_name=item.get("name"),
+        duration_ms=item.get("duration_ms"),
+        artists=tuple(a["name"] for a in (item.get("artists") or []) if a.get("name")),
+        album_name=album.get("name"),
+        album_uri=album.get("uri"),
+        images=_parse_images(album.get("images")),
+        context_type=ctx.get("type"),
+        context_uri=ctx.get("uri"),
+        device_id=dev.get("id"),
+        device_name=dev.get("name"),
+        device_type=dev.get("type"),
+        device_volume_percent=dev.get("volume_percent"),
+        device_is_active=dev.get("is_active"),
+        device_is_restricted=dev.get("is_restricted"),
+    )
+
+
+def _parse_recent_page(data: dict[str, Any]) -> list[SpotifyRecentItem]:
+    out: list[SpotifyRecentItem] = []
+    for item in data.get("items", []):
+        track = _parse_track((item or {}).get("track"))
+        if track:
+            out.append(
+                SpotifyRecentItem(
+                    uri=track.uri,
+                    name=track.name,
+                    artists=track.artists,
+                    played_at=item.get("played_at"),
+                )
+            )
+    return out
+
+
+def _parse_queue(data: dict[str, Any]) -> tuple[SpotifyTrack | None, list[SpotifyTrack]]:
+    current = _parse_track(data.get("currently_playing"))
+    queue = [t for t in map(_parse_track, data.get("queue") or []) if t]
+    return current, queue
+
+
+def _parse_upcoming(data: dict[str, Any]) -> UpcomingTrack | None:
+    item = next((it for it in data.get("queue") or [] if it and it.get("uri")), None)
+    if item is None:
+        return None
+    album = item.get("album") or {}
+    return UpcomingTrack(
+        uri=item["uri"],
+        name=item.get("name"),
+        item_type=item.get("type"),
+        artists=tuple(a["name"] for a in (item.get("artists") or []) if a.get("name")),
+        album_name=album.get("name"),
+        album_uri=album.get("uri"),
+        duration_ms=item.get("duration_ms"),
+        # Episodes carry their artwork on the item rather than an album.
+        images=_parse_images(album.get("images") or item.get("images")),
+    )
+
+
+def create_session(ssl_context: Any = None) -> aiohttp.ClientSession:
+    connector = aiohttp.TCPConnector(
+        limit=CONNECTION_LIMIT_PER_HOST * 2,
+        limit_per_host=CONNECTION_LIMIT_PER_HOST,
+        ttl_dns_cache=300,
+        keepalive_timeout=KEEPALIVE_TIMEOUT,
+        ssl=ssl_context if ssl_context is not None else True,
+    )
+    return aiohttp.ClientSession(
+        connector=connector,
+        headers={"Accept": "application/json", "Accept-Encoding": "gzip, deflate"},
+    )
+
+
 class SpotifyApi:
-    def __init__(self, session: aiohttp.ClientSession, token: str) -> None:
+    def __init__(
+        self,
+        session: aiohttp.ClientSession,
+        token: str,
+        expires_at: float | None = None,
+        token_refresher: TokenRefresher | None = None,
+        request_timeout: float = DEFAULT_REQUEST_TIMEOUT,
+        tracer: Tracer | None = None,
+    ) -> None:
         self._session = session
+        self.tracer = tracer or Tracer()
+        self.request_timeout = request_timeout
+        self._timeout = aiohttp.ClientTimeout(total=request_timeout)
+        self.last_request_at = 0.0
         self._token = token
-
-    def set_token(self, token: str) -> None:
+        self._expires_at = expires_at
+        self._token_refresher = token_refresher
+        self._refresh_task: asyncio.Task[None] | None = None
+        self._refresh_timer: asyncio.TimerHandle | None = None
+        self.auth_failed = False
+        self._inflight: dict[tuple[Any, ...], asyncio.Task[Any]] = {}
+        self.breaker = CircuitBreaker()
+        self._schedule_token_refresh()
+
+    def set_token(self, token: str, expires_at: float | None = None) -> None:
         self._token = token
+        self._expires_at = expires_at
+        self._schedule_token_refresh()
+
+    async def async_close(self) -> None:
+        if self._refresh_timer:
+            self._refresh_timer.cancel()
+            self._refresh_timer = None
+        if self._refresh_task and not self._refresh_task.done():
+            self._refresh_task.cancel()
+
+    def _token_ttl(self) -> float | None:
+        if self._expires_at is None:
+            return None
+        return self._expires_at - time.time()
+
+    def _schedule_token_refresh(self) -> None:
+        if self._refresh_timer:
+            self._refresh_timer.cancel()
+            self._refresh_timer = None
+
+        ttl = self._token_ttl()
+        if ttl is None or self._token_refresher is None:
+            return
+
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+
+        self._refresh_timer = loop.call_later(
+            max(0.0, ttl - TOKEN_REFRESH_MARGIN), self._start_token_refresh
+        )
 
-    async def _request(self, method: str, url: str, **kwargs) -> dict[str, Any]:
-        headers = kwargs.pop("headers", {})
+    def _start_token_refresh(self) -> asyncio.Task[None]:
+        if self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = asyncio.get_running_loop().create_task(self._refresh_token())
+            self._refresh_task.add_done_callback(
+                lambda task: task.cancelled() or task.exception()
+            )
+        return self._refresh_task
+
+    async def _refresh_token(self) -> None:
+        if self._token_refresher is None:
+            return
+        if self.auth_failed:
+            raise SpotifyAuthError(401, "re-authentication required")
+        try:
+            with self.tracer.span("token_refresh", "token"):
+                token = await self._token_refresher()
+        except Exception as err:
+            # Errors from the token endpoint say nothing about the Web API,
+            # so they are raised as token errors the breaker ignores.
+            status = getattr(err, "status", None) or 0
+            message = str(err) or type(err).__name__
+            if status in (400, 401):
+                # Revoked or expired grant; retrying cannot succeed.
+                self.auth_failed = True
+                raise SpotifyAuthError(status, message) from err
+            # Keep the current token; the next request or a 401 retries the refresh.
+            self._refresh_timer = asyncio.get_running_loop().call_later(
+                TOKEN_MIN_VALIDITY, self._start_token_refresh
+            )
+            raise SpotifyTokenError(status, message) from err
+        self.set_token(token["access_token"], token.get("expires_at"))
+
+    async def _async_ensure_token(self) -> None:
+        ttl = self._token_ttl()
+        if self._token_refresher is None or ttl is None:
+            return
+        if ttl > TOKEN_REFRESH_MARGIN:
+            return
+        task = self._start_token_refresh()
+        if ttl <= TOKEN_MIN_VALIDITY:
+            with self.tracer.span("token_wait", "token"):
+                await asyncio.shield(task)
+
+    async def _request(self, method: str, url: str, **kwargs) -> Any:
+        if method != "GET" or "json" in kwargs or "data" in kwargs:
+            return await self._authorized_request(method, url, **kwargs)
+
+        # Identical concurrent GETs share one network request and its result.
+        params = kwargs.get("params") or {}
+        key = (
+            url,
+            tuple(sorted((str(k), str(v)) for k, v in params.items())),
+            kwargs.get("parse"),
+        )
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.get_running_loop().create_task(
+                self._authorized_request(method, url, **kwargs)
+            )
+            self._inflight[key] = task
+
+            def _done(task: asyncio.Task[Any]) -> None:
+                self._inflight.pop(key, None)
+                if not task.cancelled():
+                    task.exception()
+
+            task.add_done_callback(_done)
+        return await asyncio.shield(task)
+
+    async def _authorized_request(self, method: str, url: str, **kwargs) -> Any:
+        if not self.breaker.allow_request():
+            raise SpotifyCircuitOpenError(self.breaker.retry_in)
+
+        try:
+            with self.tracer.span(f"{method} {url.removeprefix(SPOTIFY_API_BASE)}", "http"):
+                result = await self._authorized_send(method, url, **kwargs)
+        except SpotifyTokenError:
+            self.breaker.release_probe()
+            raise
+        except SpotifyApiError as err:
+            if err.status >= 500 or err.status == 429:
+                self.breaker.record_failure()
+            else:
+                self.breaker.record_success()
+            raise
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            self.breaker.record_failure()
+            raise
+        except BaseException:
+            self.breaker.release_probe()
+            raise
+
+        self.breaker.record_success()
+        return result
+
+    async def _authorized_send(self, method: str, url: str, **kwargs) -> Any:
+        await self._async_ensure_token()
+
+        token = self._token
+        try:
+            return await self._send(method, url, **kwargs)
+        except SpotifyApiError as err:
+            if err.status != 401 or self._token_refresher is None:
+                raise
+
+        self.tracer.annotate(retries=1)
+        if self._token == token:
+            await asyncio.shield(self._start_token_refresh())
+        return await self._send(method, url, **kwargs)
+
+    async def _send(self, method: str, url: str, **kwargs) -> Any:
+        parse: Parser | None = kwargs.pop("parse", None)
+        headers = dict(kwargs.pop("headers", {}))
         headers["Authorization"] = f"Bearer {self._token}"
 
         if "json" in kwargs:
@@ -60,93 +533,181 @@ class SpotifyApi:
         if "params" in kwargs and kwargs["params"] is None:
             kwargs.pop("params")
 
+        kwargs.setdefault("timeout", self._timeout)
+        self.last_request_at = time.monotonic()
+
         async with self._session.request(method, url, headers=headers, **kwargs) as resp:
             if resp.status == 204:
-                return {}
+                self.tracer.annotate(status=204, bytes=0)
+                return _decode(b"", parse)
 
             if resp.status >= 400:
                 txt = await resp.text()
+                self.tracer.annotate(status=resp.status, bytes=len(txt))
                 raise SpotifyApiError(resp.status, txt)
 
+            raw = await resp.read()
             ctype = resp.headers.get("Content-Type", "")
-            if "application/json" not in ctype.lower():
-                await resp.read()
-                return {}
+            self.tracer.annotate(status=resp.status, bytes=len(raw))
+
+        if "application/json" not in ctype.lower():
+            return _decode(b"", parse)
+
+        if len(raw) < JSON_EXECUTOR_THRESHOLD:
+            return _decode(raw, parse)
+        return await asyncio.get_running_loop().run_in_executor(None, _decode, raw, parse)
+
+    async def async_warm_up(self) -> None:
+        # Any cheap authorized request re-establishes DNS/TCP/TLS when the
+        # pooled connection has gone idle.
+        if time.monotonic() - self.last_request_at < WARM_UP_IDLE:
+            return
+        await self._request("GET", "https://api.spotify.com/v1/me/player/devices")
+
+    async def iter_playlists(self) -> AsyncIterator[list[SpotifyPlaylist]]:
+        async for playlists in self._iter_pages(
+            "https://api.spotify.com/v1/me/playlists", 50, _parse_playlist_page, "playlists"
+        ):
+            yield playlists
+
+    async def iter_playlist_tracks(
+        self, playlist_id: str, limit_total: int | None = None
+    ) -> AsyncIterator[list[SpotifyTrack]]:
+        async for tracks in self._iter_pages(
+            f"https://api.spotify.com/v1/playlists/{playlist_id}/tracks",
+            100,
+            _parse_track_page,
+            "tracks",
+            limit_total,
+        ):
+            yield tracks
+
+    async def iter_saved_tracks(self, limit: int | None = None) -> AsyncIterator[list[SpotifyTrack]]:
+        async for tracks in self._iter_pages(
+            "https://api.spotify.com/v1/me/tracks", 50, _parse_track_page, "tracks", limit
+        ):
+            yield tracks
+
+    async def _iter_pages(
+        self,
+        url: str,
+        page_size: int,
+        parse: Parser,
+        key: str,
+        limit: int | None = None,
+    ) -> AsyncIterator[list[Any]]:
+        if limit is not None and limit <= 0:
+            return
+
+        def fetch(offset: int) -> Awaitable[dict[str, Any]]:
+            return self._request(
+                "GET", url, params={"offset": offset, "limit": page_size}, parse=parse
+            )
 
-            return await resp.json()
+        page = await fetch(0)
+        remaining = limit
+        items = page[key] if remaining is None else page[key][:remaining]
+        if remaining is not None:
+            remaining -= len(items)
+        yield items
+        if not page["next"]:
+            return
+
+        # The first page tells us the total, so every other offset is known
+        # up front. Keep a bounded window of pages in flight and hand them
+        # out in order.
+        end = page["total"] if limit is None else min(page["total"], limit)
+        offsets = iter(range(page_size, end, page_size))
+        pending: deque[asyncio.Task[dict[str, Any]]] = deque()
+        loop = asyncio.get_running_loop()
+
+        def fill() -> None:
+            while len(pending) < PAGE_FETCH_CONCURRENCY:
+                offset = next(offsets, None)
+                if offset is None:
+                    return
+                pending.append(loop.create_task(fetch(offset)))
+
+        try:
+            fill()
+            while pending and (remaining is None or remaining > 0):
+                page = await pending.popleft()
+                fill()
+                items = page[key] if remaining is None else page[key][:remaining]
+                if remaining is not None:
+                    remaining -= len(items)
+                yield items
+        finally:
+            for task in pending:
+                if task.done() and not task.cancelled():
+                    task.exception()
+                else:
+                    task.cancel()
 
     async def get_playlists(self) -> list[SpotifyPlaylist]:
-        url = "https://api.spotify.com/v1/me/playlists?limit=50"
         out: list[SpotifyPlaylist] = []
-        while url:
-            data = await self._request("GET", url)
-            for it in data.get("items", []):
-                out.append(SpotifyPlaylist(id=it["id"], name=it["name"]))
-            url = data.get("next")
+        async for playlists in self.iter_playlists():
+            out.extend(playlists)
         return out
 
     async def get_playlist_tracks(self, playlist_id: str, limit_total: int = 128) -> list[SpotifyTrack]:
-        url = f"https://api.spotify.com/v1/playlists/{playlist_id}/tracks?limit=100"
         out: list[SpotifyTrack] = []
-
-        while url and len(out) < limit_total:
-            data = await self._request("GET", url)
-            for item in data.get("items", []):
-                t = item.get("track") or {}
-                uri = t.get("uri")
-                if not uri:
-                    continue
-                name = t.get("name", "Unknown")
-                artists = ", ".join(a.get("name", "") for a in (t.get("artists") or [])) or "Unknown"
-                out.append(SpotifyTrack(uri=uri, name=name, artists=artists))
-                if len(out) >= limit_total:
-                    break
-            url = data.get("next")
-
+        async for tracks in self.iter_playlist_tracks(playlist_id, limit_total):
+            out.extend(tracks)
         return out
 
+    async def get_playlist_tracks_page(
+        self, playlist_id: str, offset: int, limit: int = 100
+    ) -> tuple[list[SpotifyTrack], int]:
+        page = await self._request(
+            "GET",
+            f"https://api.spotify.com/v1/playlists/{playlist_id}/tracks",
+            params={"offset": offset, "limit": min(limit, 100)},
+            parse=_parse_track_page,
+        )
+        return page["tracks"], page["total"]
+
+    async def get_playlists_page(
+        self, offset: int, limit: int = 50
+    ) -> tuple[list[SpotifyPlaylist], int]:
+        page = await self._request(
+            "GET",
+            "https://api.spotify.com/v1/me/playlists",
+            params={"offset": offset, "limit": min(limit, 50)},
+            parse=_parse_playlist_page,
+        )
+        return page["playlists"], page["total"]
+
+    async def get_saved_tracks_page(
+        self, offset: int, limit: int = 50
+    ) -> tuple[list[SpotifyTrack], int]:
+        page = await self._request(
+            "GET",
+            "https://api.spotify.com/v1/me/tracks",
+            params={"offset": offset, "limit": min(limit, 50)},
+            parse=_parse_track_page,
+        )
+        return page["tracks"], page["total"]
+
     async def get_saved_tracks(self, limit: int = 50) -> list[SpotifyTrack]:
-        url = "https://api.spotify.com/v1/me/tracks?limit=50"
         out: list[SpotifyTrack] = []
-
-        while url and len(out) < limit:
-            data = await self._request("GET", url)
-            for item in data.get("items", []):
-                t = (item or {}).get("track") or {}
-                uri = t.get("uri")
-                if not uri:
-                    continue
-                name = t.get("name", "Unknown")
-                artists = ", ".join(a.get("name", "") for a in (t.get("artists") or [])) or "Unknown"
-                out.append(SpotifyTrack(uri=uri, name=name, artists=artists))
-                if len(out) >= limit:
-                    break
-            url = data.get("next")
-
+        async for tracks in self.iter_saved_tracks(limit):
+            out.extend(tracks)
         return out
 
     async def get_recently_played(self, limit: int = 50) -> list[SpotifyRecentItem]:
         url = f"https://api.spotify.com/v1/me/player/recently-played?limit={min(limit, 50)}"
-        out: list[SpotifyRecentItem] = []
-
-        data = await self._request("GET", url)
-        for item in data.get("items", []):
-            t = (item or {}).get("track") or {}
-            uri = t.get("uri")
-            if not uri:
-                continue
-            name = t.get("name", "Unknown")
-            artists = ", ".join(a.get("name", "") for a in (t.get("artists") or [])) or "Unknown"
-            out.append(
-                SpotifyRecentItem(
-                    uri=uri,
-                    name=name,
-                    artists=artists,
-                    played_at=item.get("played_at"),
-                )
-            )
+        return await self._request("GET", url, parse=_parse_recent_page)
 
-        return out
+    async def get_queue(self) -> tuple[SpotifyTrack | None, list[SpotifyTrack]]:
+        return await self._request(
+            "GET", "https://api.spotify.com/v1/me/player/queue", parse=_parse_queue
+        )
+
+    async def get_upcoming(self) -> UpcomingTrack | None:
+        return await self._request(
+            "GET", "https://api.spotify.com/v1/me/player/queue", parse=_parse_upcoming
+        )
 
     async def get_devices(self) -> list[SpotifyDevice]:
         data = await self._request("GET", "https://api.spotify.com/v1/me/player/devices")
@@ -161,12 +722,54 @@ class SpotifyApi:
         ]
 
     async def start_playback(self, device_id: str, track_uri: str) -> None:
+        await self.play_uris(device_id, [track_uri])
+
+    async def play_uris(
+        self,
+        device_id: str,
+        uris: list[str],
+        offset: int | str | None = None,
+        position_ms: int | None = None,
+    ) -> None:
+        if not uris:
+            return
+
+        if isinstance(offset, str):
+            if offset not in uris:
+                raise ValueError(f"{offset} is not in the track list")
+            start = uris.index(offset)
+        else:
+            start = min(max(offset or 0, 0), len(uris) - 1)
+
+        # The play endpoint takes a bounded URI list. The window is the block
+        # of PLAY_URIS_LIMIT holding the offset (the first one when it fits),
+        # so the tracks before the offset stay in the context; anything after
+        # the window is appended to the queue.
+        window_start = max(0, min(start - start % PLAY_URIS_LIMIT, len(uris) - PLAY_URIS_LIMIT))
+        window = uris[window_start : window_start + PLAY_URIS_LIMIT]
+        position = start - window_start
+        rest = uris[window_start + PLAY_URIS_LIMIT :]
+        if len(rest) > PLAY_URIS_QUEUE_LIMIT:
+            raise ValueError(
+                f"At most {PLAY_URIS_LIMIT + PLAY_URIS_QUEUE_LIMIT} tracks can be started at once"
+            )
+
+        body: dict[str, Any] = {"uris": window}
+        if position:
+            body["offset"] = {"position": position}
+        if position_ms:
+            body["position_ms"] = position_ms
+
         await self._request(
             "PUT",
-            f"https://api.spotify.com/v1/me/player/play?device_id={device_id}",
-            json={"uris": [track_uri]},
+            "https://api.spotify.com/v1/me/player/play",
+            params={"device_id": device_id},
+            json=body,
         )
 
+        for uri in rest:
+            await self.add_to_queue(device_id, uri)
+
     async def add_to_queue(self, device_id: str, track_uri: str) -> None:
         await self._request(
             "POST",
@@ -174,8 +777,8 @@ class SpotifyApi:
             params={"uri": track_uri, "device_id": device_id},
         )
 
-    async def get_player(self) -> dict[str, Any]:
-        return await self._request("GET", "https://api.spotify.com/v1/me/player")
+    async def get_player(self) -> PlayerState | None:
+        return await self._request("GET", "https://api.spotify.com/v1/me/player", parse=_parse_player)
 
     async def pause(self, device_id: str | None = None) -> None:
         await self._request(
@@ -219,12 +822,25 @@ class SpotifyApi:
             params={"state": state, **({"device_id": device_id} if device_id else {})},
         )
 
+    async def set_volume(self, volume_percent: int, device_id: str | None = None) -> None:
+        await self._request(
+            "PUT",
+            "https://api.spotify.com/v1/me/player/volume",
+            params={
+                "volume_percent": max(0, min(100, int(volume_percent))),
+                **({"device_id": device_id} if device_id else {}),
+            },
+        )
+
     async def start_playlist(self, device_id: str, playlist_id: str) -> None:
+        await self.start_context(device_id, f"spotify:playlist:{playlist_id}")
+
+    async def start_context(self, device_id: str, context_uri: str) -> None:
         await self._request(
             "PUT",
             "https://api.spotify.com/v1/me/player/play",
             params={"device_id": device_id},
-            json={"context_uri": f"spotify:playlist:{playlist_id}"},
+            json={"context_uri": context_uri},
         )
 
     async def start_playlist_at_track(self, device_id: str, playlist_id: str, track_uri: str) -> None:
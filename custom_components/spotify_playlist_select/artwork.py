@@ -0,0 +1,255 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import io
+import logging
+import os
+from collections import OrderedDict
+from http import HTTPStatus
+
+import aiohttp
+from aiohttp import web
+
+from homeassistant.components.http import HomeAssistantView
+from homeassistant.core import HomeAssistant
+
+from .const import ARTWORK_URL_CACHE_SIZE, DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+ARTWORK_URL = f"/api/{DOMAIN}/artwork/{{key}}"
+
+_EXTENSIONS = {"image/jpeg": ".jpg", "image/png": ".png", "image/webp": ".webp"}
+_CONTENT_TYPES = {ext: ctype for ctype, ext in _EXTENSIONS.items()}
+
+
+def _artwork_key(url: str, size: int | None = None) -> str:
+    raw = f"{url}@{size}" if size else url
+    return hashlib.sha1(raw.encode()).hexdigest()
+
+
+def _thumbnail(data: bytes, size: int) -> tuple[bytes, str] | None:
+    try:
+        from PIL import Image
+    except ImportError:
+        return None
+
+    try:
+        with Image.open(io.BytesIO(data)) as img:
+            if max(img.size) <= size:
+                return None
+            img.thumbnail((size, size))
+            out = io.BytesIO()
+            img.convert("RGB").save(out, "JPEG", quality=85)
+    except (OSError, Image.DecompressionBombError) as err:
+        # Serve the original bytes when Pillow cannot decode them.
+        _LOGGER.debug("Could not resize artwork: %s", err)
+        return None
+    return out.getvalue(), "image/jpeg"
+
+
+class ArtworkCache:
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        session: aiohttp.ClientSession,
+        directory: str,
+        max_disk_bytes: int,
+        max_memory_bytes: int,
+    ) -> None:
+        self.hass = hass
+        self._session = session
+        self._directory = directory
+        self._max_disk_bytes = max_disk_bytes
+        self._max_memory_bytes = max_memory_bytes
+
+        self._memory: OrderedDict[str, tuple[bytes, str]] = OrderedDict()
+        self._memory_bytes = 0
+        self._disk: OrderedDict[str, tuple[str, int]] = OrderedDict()
+        self._disk_bytes = 0
+
+        # Key -> source URL for keys handed out by local_url, so the view
+        # can fetch on a miss. Bounded like the memory cache; a key that
+        # fell out is still served while its image is cached.
+        self._urls: OrderedDict[str, tuple[str, int | None]] = OrderedDict()
+        self._pending: dict[str, asyncio.Task[tuple[bytes, str] | None]] = {}
+
+    async def async_setup(self) -> None:
+        entries = await self.hass.async_add_executor_job(self._scan_directory)
+        for key, path, size in entries:
+            self._disk[key] = (path, size)
+            self._disk_bytes += size
+        await self._async_evict_disk()
+
+    def _scan_directory(self) -> list[tuple[str, str, int]]:
+        os.makedirs(self._directory, exist_ok=True)
+        found: list[tuple[float, str, str, int]] = []
+        with os.scandir(self._directory) as it:
+            for entry in it:
+                key, ext = os.path.splitext(entry.name)
+                if ext not in _CONTENT_TYPES or not entry.is_file():
+                    continue
+                st = entry.stat()
+                found.append((st.st_mtime, key, entry.path, st.st_size))
+        found.sort()
+        return [(key, path, size) for _, key, path, size in found]
+
+    def local_url(self, url: str, size: int | None = None) -> str:
+        key = _artwork_key(url, size)
+        self._urls[key] = (url, size)
+        self._urls.move_to_end(key)
+        while len(self._urls) > ARTWORK_URL_CACHE_SIZE:
+            self._urls.popitem(last=False)
+        return ARTWORK_URL.format(key=key)
+
+    async def async_get_by_key(self, key: str) -> tuple[bytes, str] | None:
+        if key in self._memory or key in self._disk:
+            return await self._async_load(key)
+        if key not in self._urls:
+            return None
+        url, size = self._urls[key]
+        return await self.async_get(url, size)
+
+    async def async_get(self, url: str, size: int | None = None) -> tuple[bytes, str] | None:
+        key = _artwork_key(url, size)
+
+        cached = await self._async_load(key)
+        if cached is not None:
+            return cached
+
+        task = self._pending.get(key)
+        if task is None:
+            task = self.hass.async_create_task(self._async_fetch(key, url, size))
+            self._pending[key] = task
+            task.add_done_callback(lambda _: self._pending.pop(key, None))
+        return await asyncio.shield(task)
+
+    async def async_prefetch(self, url: str, size: int | None = None) -> None:
+        try:
+            await self.async_get(url, size)
+        except (aiohttp.ClientError, asyncio.TimeoutError, OSError) as err:
+            _LOGGER.debug("Artwork prefetch failed for %s: %s", url, err)
+
+    async def _async_load(self, key: str) -> tuple[bytes, str] | None:
+        if key in self._memory:
+            self._memory.move_to_end(key)
+            return self._memory[key]
+
+        if key not in self._disk:
+            return None
+
+        path, _ = self._disk[key]
+        try:
+            data = await self.hass.async_add_executor_job(self._read_file, path)
+        except OSError:
+            self._drop_disk_entry(key)
+            return None
+
+        self._disk.move_to_end(key)
+        result = (data, _CONTENT_TYPES[os.path.splitext(path)[1]])
+        self._remember(key, result)
+        return result
+
+    async def _async_fetch(self, key: str, url: str, size: int | None) -> tuple[bytes, str] | None:
+        if size:
+            original = await self.async_get(url)
+            if original is None:
+                return None
+            thumb = await self.hass.async_add_executor_job(_thumbnail, original[0], size)
+            result = thumb or original
+        else:
+            async with self._session.get(url, timeout=aiohttp.ClientTimeout(total=10)) as resp:
+                resp.raise_for_status()
+                ctype = resp.headers.get("Content-Type", "image/jpeg").split(";")[0].strip()
+                result = (await resp.read(), ctype)
+
+        self._remember(key, result)
+        await self._async_store(key, result)
+        return result
+
+    def _remember(self, key: str, result: tuple[bytes, str]) -> None:
+        if key in self._memory:
+            self._memory.move_to_end(key)
+            return
+        self._memory[key] = result
+        self._memory_bytes += len(result[0])
+        while self._memory_bytes > self._max_memory_bytes and len(self._memory) > 1:
+            _, (data, _) = self._memory.popitem(last=False)
+            self._memory_bytes -= len(data)
+
+    async def _async_store(self, key: str, result: tuple[bytes, str]) -> None:
+        ext = _EXTENSIONS.get(result[1])
+        if ext is None:
+            return
+        path = os.path.join(self._directory, f"{key}{ext}")
+        try:
+            await self.hass.async_add_executor_job(self._write_file, path, result[0])
+        except OSError as err:
+            _LOGGER.debug("Could not write artwork cache file %s: %s", path, err)
+            return
+        self._drop_disk_entry(key)
+        self._disk[key] = (path, len(result[0]))
+        self._disk_bytes += len(result[0])
+        await self._async_evict_disk()
+
+    async def _async_evict_disk(self) -> None:
+        stale: list[str] = []
+        while self._disk_bytes > self._max_disk_bytes and self._disk:
+            key, (path, size) = self._disk.popitem(last=False)
+            self._disk_bytes -= size
+            stale.append(path)
+        if stale:
+            await self.hass.async_add_executor_job(self._remove_files, stale)
+
+    def _drop_disk_entry(self, key: str) -> None:
+        entry = self._disk.pop(key, None)
+        if entry:
+            self._disk_bytes -= entry[1]
+
+    @staticmethod
+    def _read_file(path: str) -> bytes:
+        with open(path, "rb") as f:
+            return f.read()
+
+    @staticmethod
+    def _write_file(path: str, data: bytes) -> None:
+        tmp = f"{path}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+
+    @staticmethod
+    def _remove_files(paths: list[str]) -> None:
+        for path in paths:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+
+class SpotifyArtworkView(HomeAssistantView):
+    url = ARTWORK_URL
+    name = f"api:{DOMAIN}:artwork"
+    # Keys are hashes of public Spotify CDN URLs that the integration has seen.
+    requires_auth = False
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        self.hass = hass
+
+    async def get(self, request: web.Request, key: str) -> web.Response:
+        for rt in self.hass.data.get(DOMAIN, {}).values():
+            if not isinstance(rt, dict) or "artwork" not in rt:
+                continue
+            try:
+                result = await rt["artwork"].async_get_by_key(key)
+            except (aiohttp.ClientError, asyncio.TimeoutError, OSError):
+                return web.Response(status=HTTPStatus.BAD_GATEWAY)
+            if result is not None:
+                data, ctype = result
+                return web.Response(
+                    body=data,
+                    content_type=ctype,
+                    headers={"Cache-Control": "public, max-age=86400, immutable"},
+                )
+        return web.Response(status=HTTPStatus.NOT_FOUND)
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import logging
+from collections.abc import Mapping
 from typing import Any
 
 import voluptuous as vol
@@ -9,9 +10,18 @@ from homeassistant import config_entries
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers import config_entry_oauth2_flow
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
-from homeassistant.helpers.selector import SelectSelector, SelectSelectorConfig
+from homeassistant.helpers.selector import (
+    BooleanSelector,
+    NumberSelector,
+    NumberSelectorConfig,
+    NumberSelectorMode,
+    SelectSelector,
+    SelectSelectorConfig,
+    TextSelector,
+)
 
-from .api import SpotifyApi
+from .api import DEFAULT_REQUEST_TIMEOUT, SpotifyApi, SpotifyPlaylist
+from .coordinator import SpotifyCoordinator
 from .const import (
     DOMAIN,
     CONF_PLAY_MODE,
@@ -19,11 +29,66 @@ from .const import (
     PLAY_MODE_QUEUE_PLAY,
     SPOTIFY_SCOPES,
     CONF_SELECTED_PLAYLIST_IDS,
+    CONF_ARTWORK_THUMBNAIL_SIZE,
+    CONF_TRACK_PAGE_SIZE,
+    CONF_REQUEST_TIMEOUT,
+    CONF_SYNC_ALL_LIKED_SONGS,
+    CONF_TRACING,
+    CONF_PLAYLIST_FILTER,
+    CONF_PLAYLIST_PAGE,
+    OPTIONS_PLAYLIST_PAGE_SIZE,
 )
 
 _LOGGER = logging.getLogger(__name__)
 
 
+def _playlist_fields(
+    playlists: list[SpotifyPlaylist],
+    selected: set[str],
+    query: str,
+    page: int,
+) -> tuple[dict[Any, Any], set[str], int]:
+    # Selected playlists are always listed so they can be deselected; the
+    # rest is filtered by name and split into pages.
+    needle = query.strip().casefold()
+    chosen = [p for p in playlists if p.id in selected]
+    matches = [
+        p for p in playlists
+        if p.id not in selected and (not needle or needle in p.name.casefold())
+    ]
+
+    pages = max(1, -(-len(matches) // OPTIONS_PLAYLIST_PAGE_SIZE))
+    page = min(max(page, 1), pages)
+    start = (page - 1) * OPTIONS_PLAYLIST_PAGE_SIZE
+    shown = chosen + matches[start : start + OPTIONS_PLAYLIST_PAGE_SIZE]
+
+    fields: dict[Any, Any] = {
+        vol.Optional(CONF_PLAYLIST_FILTER, default=query): TextSelector(),
+        vol.Optional(CONF_PLAYLIST_PAGE, default=page): NumberSelector(
+            NumberSelectorConfig(min=1, max=pages, step=1, mode=NumberSelectorMode.BOX)
+        ),
+        vol.Optional(CONF_SELECTED_PLAYLIST_IDS, default=[p.id for p in chosen]): SelectSelector(
+            SelectSelectorConfig(
+                options=[{"label": p.name, "value": p.id} for p in shown],
+                multiple=True,
+                mode="list",
+            )
+        ),
+    }
+    return fields, {p.id for p in shown}, page
+
+
+def _merge_selection(selected: set[str], shown: set[str], user_input: dict[str, Any]) -> set[str]:
+    return (selected - shown) | set(user_input.get(CONF_SELECTED_PLAYLIST_IDS) or [])
+
+
+def _navigation_changed(query: str, page: int, user_input: dict[str, Any]) -> bool:
+    return (
+        user_input.get(CONF_PLAYLIST_FILTER, "") != query
+        or int(user_input.get(CONF_PLAYLIST_PAGE) or 1) != page
+    )
+
+
 class ConfigFlow(config_entry_oauth2_flow.AbstractOAuth2FlowHandler, domain=DOMAIN):
 
     DOMAIN = DOMAIN
@@ -31,6 +96,11 @@ class ConfigFlow(config_entry_oauth2_flow.AbstractOAuth2FlowHandler, domain=DOMA
 
     def __init__(self) -> None:
         self._pending: dict[str, Any] = {}
+        self._playlists: list[SpotifyPlaylist] | None = None
+        self._selected: set[str] = set()
+        self._shown: set[str] = set()
+        self._query = ""
+        self._page = 1
 
     @property
     def logger(self) -> logging.Logger:
@@ -75,40 +145,46 @@ class ConfigFlow(config_entry_oauth2_flow.AbstractOAuth2FlowHandler, domain=DOMA
         self.logger.debug("OAuth scopes requested: %s", self.scopes)
         return await super().async_step_auth(user_input)
 
+    async def async_step_reauth(self, entry_data: Mapping[str, Any]):
+        return await self.async_step_reauth_confirm()
+
+    async def async_step_reauth_confirm(self, user_input: dict[str, Any] | None = None):
+        if user_input is None:
+            return self.async_show_form(step_id="reauth_confirm")
+        return await self.async_step_pick_implementation()
+
     async def async_oauth_create_entry(self, data: dict[str, Any]):
+        if self.source == config_entries.SOURCE_REAUTH:
+            return self.async_update_reload_and_abort(
+                self._get_reauth_entry(), data_updates=data
+            )
         self._pending.update(data)
         return await self.async_step_playlists()
 
     async def async_step_playlists(self, user_input: dict[str, Any] | None = None):
-        session = async_get_clientsession(self.hass)
-
-        token = self._pending.get("token", {})
-        access_token = token.get("access_token")
-        if not access_token:
-            return self.async_abort(reason="oauth_error")
-
-        api = SpotifyApi(session, access_token)
-        playlists = await api.get_playlists()
-
-        pl_options = [{"label": p.name, "value": p.id} for p in playlists]
-
-        if user_input is None:
-            schema = vol.Schema(
-                {
-                    vol.Required(CONF_SELECTED_PLAYLIST_IDS, default=[]): SelectSelector(
-                        SelectSelectorConfig(
-                            options=pl_options,
-                            multiple=True,
-                            mode="list",
-                        )
-                    )
-                }
-            )
-            return self.async_show_form(step_id="playlists", data_schema=schema)
-
-        selected_ids = user_input[CONF_SELECTED_PLAYLIST_IDS]
-        self._pending[CONF_SELECTED_PLAYLIST_IDS] = selected_ids
-        return self.async_create_entry(title="Spotify Playlist Select", data=self._pending)
+        if self._playlists is None:
+            session = async_get_clientsession(self.hass)
+
+            token = self._pending.get("token", {})
+            access_token = token.get("access_token")
+            if not access_token:
+                return self.async_abort(reason="oauth_error")
+
+            api = SpotifyApi(session, access_token)
+            self._playlists = await api.get_playlists()
+
+        if user_input is not None:
+            self._selected = _merge_selection(self._selected, self._shown, user_input)
+            if not _navigation_changed(self._query, self._page, user_input):
+                self._pending[CONF_SELECTED_PLAYLIST_IDS] = sorted(self._selected)
+                return self.async_create_entry(title="Spotify Playlist Select", data=self._pending)
+            self._query = user_input.get(CONF_PLAYLIST_FILTER, "")
+            self._page = int(user_input.get(CONF_PLAYLIST_PAGE) or 1)
+
+        fields, self._shown, self._page = _playlist_fields(
+            self._playlists, self._selected, self._query, self._page
+        )
+        return self.async_show_form(step_id="playlists", data_schema=vol.Schema(fields))
 
     @staticmethod
     @callback
@@ -121,8 +197,23 @@ class OptionsFlowHandler(config_entries.OptionsFlow):
 
     def __init__(self, entry: config_entries.ConfigEntry) -> None:
         self.entry = entry
+        self._playlists: list[SpotifyPlaylist] | None = None
+        current = entry.options.get(CONF_SELECTED_PLAYLIST_IDS) or entry.data.get(CONF_SELECTED_PLAYLIST_IDS, [])
+        self._selected: set[str] = set(current or [])
+        self._shown: set[str] = set()
+        self._query = ""
+        self._page = 1
+
+    async def _async_get_playlists(self) -> list[SpotifyPlaylist]:
+        rt = self.hass.data.get(DOMAIN, {}).get(self.entry.entry_id)
+        if rt:
+            coordinator: SpotifyCoordinator = rt["coordinator"]
+            if coordinator.library_stale:
+                self.hass.async_create_task(coordinator.async_refresh_library())
+            if coordinator.data and coordinator.data.playlists:
+                return coordinator.data.playlists
+            return await rt["api"].get_playlists()
 
-    async def async_step_init(self, user_input: dict[str, Any] | None = None):
         session = async_get_clientsession(self.hass)
 
         implementation = await config_entry_oauth2_flow.async_get_config_entry_implementation(
@@ -132,26 +223,63 @@ class OptionsFlowHandler(config_entries.OptionsFlow):
         await oauth.async_ensure_token_valid()
 
         api = SpotifyApi(session, oauth.token["access_token"])
-        playlists = await api.get_playlists()
-        pl_options = [{"label": p.name, "value": p.id} for p in playlists]
-
-        current = self.entry.options.get(CONF_SELECTED_PLAYLIST_IDS) or self.entry.data.get(CONF_SELECTED_PLAYLIST_IDS, [])
+        return await api.get_playlists()
 
-        if user_input is None:
-            schema = vol.Schema(
-                {
-                    vol.Required(CONF_SELECTED_PLAYLIST_IDS, default=current): SelectSelector(
-                        SelectSelectorConfig(
-                            options=pl_options,
-                            multiple=True,
-                            mode="list",
-                        )
-                    )
-                }
+    async def async_step_init(self, user_input: dict[str, Any] | None = None):
+        if self._playlists is None:
+            self._playlists = await self._async_get_playlists()
+
+        settings = {
+            CONF_ARTWORK_THUMBNAIL_SIZE: self.entry.options.get(CONF_ARTWORK_THUMBNAIL_SIZE, 0),
+            CONF_TRACK_PAGE_SIZE: self.entry.options.get(CONF_TRACK_PAGE_SIZE, 0),
+            CONF_REQUEST_TIMEOUT: self.entry.options.get(CONF_REQUEST_TIMEOUT, DEFAULT_REQUEST_TIMEOUT),
+            CONF_SYNC_ALL_LIKED_SONGS: self.entry.options.get(CONF_SYNC_ALL_LIKED_SONGS, False),
+            CONF_TRACING: self.entry.options.get(CONF_TRACING, False),
+        }
+
+        if user_input is not None:
+            self._selected = _merge_selection(self._selected, self._shown, user_input)
+            settings = {key: user_input.get(key, value) for key, value in settings.items()}
+            if not _navigation_changed(self._query, self._page, user_input):
+                return self.async_create_entry(
+                    title="",
+                    data={CONF_SELECTED_PLAYLIST_IDS: sorted(self._selected), **settings},
+                )
+            self._query = user_input.get(CONF_PLAYLIST_FILTER, "")
+            self._page = int(user_input.get(CONF_PLAYLIST_PAGE) or 1)
+
+        fields, self._shown, self._page = _playlist_fields(
+            self._playlists, self._selected, self._query, self._page
+        )
+        fields[
+            vol.Optional(CONF_ARTWORK_THUMBNAIL_SIZE, default=settings[CONF_ARTWORK_THUMBNAIL_SIZE])
+        ] = NumberSelector(
+            NumberSelectorConfig(
+                min=0,
+                max=640,
+                step=16,
+                unit_of_measurement="px",
+                mode=NumberSelectorMode.BOX,
             )
-            return self.async_show_form(step_id="init", data_schema=schema)
-
-        return self.async_create_entry(title="", data=user_input)
-
-
-
+        )
+        fields[
+            vol.Optional(CONF_TRACK_PAGE_SIZE, default=settings[CONF_TRACK_PAGE_SIZE])
+        ] = NumberSelector(
+            NumberSelectorConfig(min=0, max=100, step=1, mode=NumberSelectorMode.BOX)
+        )
+        fields[
+            vol.Optional(CONF_REQUEST_TIMEOUT, default=settings[CONF_REQUEST_TIMEOUT])
+        ] = NumberSelector(
+            NumberSelectorConfig(
+                min=2,
+                max=60,
+                step=1,
+                unit_of_measurement="s",
+                mode=NumberSelectorMode.BOX,
+            )
+        )
+        fields[
+            vol.Optional(CONF_SYNC_ALL_LIKED_SONGS, default=settings[CONF_SYNC_ALL_LIKED_SONGS])
+        ] = BooleanSelector()
+        fields[vol.Optional(CONF_TRACING, default=settings[CONF_TRACING])] = BooleanSelector()
+        return self.async_show_form(step_id="init", data_schema=vol.Schema(fields))
@@ -23,15 +23,75 @@ CONTEXT_RECENT = "recently_played"
 
 PLATFORMS = ["select", "media_player", "sensor"]
 
+EVENT_TRACK_CHANGED = f"{DOMAIN}_track_changed"
+EVENT_DEVICE_CHANGED = f"{DOMAIN}_device_changed"
+EVENT_CONTEXT_CHANGED = f"{DOMAIN}_context_changed"
+EVENT_PLAYBACK_STARTED = f"{DOMAIN}_playback_started"
+EVENT_PLAYBACK_STOPPED = f"{DOMAIN}_playback_stopped"
+
 SERVICE_PLAY_PLAYLIST = "play_playlist"
 SERVICE_PLAY_TRACK_IN_PLAYLIST = "play_track_in_playlist"
 SERVICE_QUEUE_TRACK = "queue_track"
 SERVICE_REFRESH_LIBRARY = "refresh_library"
+SERVICE_PLAY_TRACKS = "play_tracks"
+SERVICE_GET_PLAYLISTS = "get_playlists"
+SERVICE_GET_PLAYLIST_TRACKS = "get_playlist_tracks"
+SERVICE_GET_LIKED_SONGS = "get_liked_songs"
+SERVICE_GET_RECENTLY_PLAYED = "get_recently_played"
+SERVICE_GET_QUEUE = "get_queue"
+SERVICE_DUMP_TRACE = "dump_trace"
+SERVICE_SCHEDULE_PLAYBACK = "schedule_playback"
+SERVICE_CANCEL_SCHEDULED_PLAYBACK = "cancel_scheduled_playback"
+SERVICE_VOLUME_RAMP = "volume_ramp"
 
 TRACK_LIMIT_PER_PLAYLIST = 128
+CONF_TRACK_PAGE_SIZE = "track_page_size"
+TRACK_PAGE_CACHE_SIZE = 8
 SAVED_TRACKS_LIMIT = 128
+CONF_SYNC_ALL_LIKED_SONGS = "sync_all_liked_songs"
 RECENT_TRACKS_LIMIT = 50
 LIKED_SONGS_LIMIT = 128
 RECENTLY_PLAYED_LIMIT = 128
 
 CONF_SELECTED_PLAYLIST_IDS = "selected_playlist_ids"
+CONF_PLAYLIST_FILTER = "playlist_filter"
+CONF_PLAYLIST_PAGE = "playlist_page"
+OPTIONS_PLAYLIST_PAGE_SIZE = 50
+LIBRARY_STALE_SECONDS = 3600
+DEVICES_TTL_SECONDS = 6 * 3600
+UPCOMING_PREFETCH_LEAD = 15.0
+TRACK_END_MARGIN = 1.0
+LIBRARY_PUSH_INTERVAL = 5.0
+LIBRARY_RETRY_BASE = 30.0
+LIBRARY_RETRY_MAX = 1800.0
+
+CONF_ARTWORK_THUMBNAIL_SIZE = "artwork_thumbnail_size"
+ARTWORK_DISK_CACHE_BYTES = 20 * 1024 * 1024
+ARTWORK_MEMORY_CACHE_BYTES = 4 * 1024 * 1024
+ARTWORK_URL_CACHE_SIZE = 256
+
+CONF_REQUEST_TIMEOUT = "request_timeout"
+
+CONF_TRACING = "tracing"
+TRACE_BUFFER_SIZE = 2000
+
+SECTION_DEVICES = "devices"
+SECTION_PLAYER = "player"
+SECTION_SAVED_TRACKS = "saved_tracks"
+SECTION_RECENT_TRACKS = "recent_tracks"
+# Per-section poll budgets at the default request timeout; the coordinator
+# scales them with the configured one.
+SECTION_TIMEOUTS = {
+    SECTION_DEVICES: 5.0,
+    SECTION_PLAYER: 5.0,
+    SECTION_SAVED_TRACKS: 8.0,
+    SECTION_RECENT_TRACKS: 5.0,
+}
+
+SCHEDULE_WARM_UP_LEAD = 30.0
+SCHEDULE_KEEPALIVE_LEAD = 5.0
+SCHEDULE_SOUND_POLL_INTERVAL = 0.25
+SCHEDULE_SOUND_TIMEOUT = 15.0
+
+VOLUME_MIN_INTERVAL = 0.5
+VOLUME_OPTIMISTIC_HOLD = 3.0
@@ -1,15 +1,55 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+import asyncio
+import logging
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, replace
 from datetime import timedelta
-from typing import Any
+from functools import partial
+from time import monotonic, time
+from typing import Any, TypeVar
 
-from homeassistant.core import HomeAssistant
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.exceptions import ConfigEntryAuthFailed
+from homeassistant.helpers.event import async_call_later
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
-from homeassistant.helpers import config_entry_oauth2_flow
 
-from .api import SpotifyApi, SpotifyDevice, SpotifyPlaylist, SpotifyTrack, SpotifyRecentItem
-from .const import TRACK_LIMIT_PER_PLAYLIST, SAVED_TRACKS_LIMIT, RECENTLY_PLAYED_LIMIT
+from .api import CIRCUIT_CLOSED, CIRCUIT_OPEN, DEFAULT_REQUEST_TIMEOUT, PlayerState, SpotifyApi, SpotifyApiError, SpotifyAuthError, SpotifyDevice, SpotifyPlaylist, SpotifyTrack, SpotifyRecentItem, UpcomingTrack
+from .const import (
+    DEVICES_TTL_SECONDS,
+    DOMAIN,
+    EVENT_CONTEXT_CHANGED,
+    EVENT_DEVICE_CHANGED,
+    EVENT_PLAYBACK_STARTED,
+    EVENT_PLAYBACK_STOPPED,
+    EVENT_TRACK_CHANGED,
+    LIBRARY_PUSH_INTERVAL,
+    LIBRARY_RETRY_BASE,
+    LIBRARY_RETRY_MAX,
+    LIBRARY_STALE_SECONDS,
+    TRACK_END_MARGIN,
+    TRACK_LIMIT_PER_PLAYLIST,
+    UPCOMING_PREFETCH_LEAD,
+    SAVED_TRACKS_LIMIT,
+    RECENTLY_PLAYED_LIMIT,
+    SECTION_DEVICES,
+    SECTION_PLAYER,
+    SECTION_RECENT_TRACKS,
+    SECTION_SAVED_TRACKS,
+    SECTION_TIMEOUTS,
+)
+from .planner import PlannedCall
+
+_LOGGER = logging.getLogger(__name__)
+
+_T = TypeVar("_T")
+
+
+@dataclass
+class SectionStatus:
+    updated_at: float | None = None
+    error: str | None = None
+    failures: int = 0
 
 
 @dataclass
@@ -19,7 +59,87 @@ class SpotifyData:
     saved_tracks: list[SpotifyTrack]
     recent_tracks: list[SpotifyRecentItem]
     playlist_tracks: dict[str, list[SpotifyTrack]]
-    player: dict[str, Any] | None
+    player: PlayerState | None
+
+
+def _player_events(
+    old: PlayerState | None, new: PlayerState | None
+) -> list[tuple[str, dict[str, Any]]]:
+    events: list[tuple[str, dict[str, Any]]] = []
+    if old == new:
+        return events
+
+    old_uri = old.item_uri if old else None
+    old_device = old.device_id if old else None
+    old_ctx = old.context_uri if old else None
+
+    if new and new.item_uri and new.item_uri != old_uri:
+        events.append(
+            (
+                EVENT_TRACK_CHANGED,
+                {
+                    "uri": new.item_uri,
+                    "name": new.item_name,
+                    "artists": list(new.artists),
+                    "album": new.album_name,
+                    "duration_ms": new.duration_ms,
+                    "context_uri": new.context_uri,
+                    "previous_uri": old_uri,
+                },
+            )
+        )
+
+    if new and new.device_id and new.device_id != old_device:
+        events.append(
+            (
+                EVENT_DEVICE_CHANGED,
+                {
+                    "device_id": new.device_id,
+                    "device_name": new.device_name,
+                    "device_type": new.device_type,
+                    "previous_device_id": old_device,
+                },
+            )
+        )
+
+    new_ctx = new.context_uri if new else None
+    if new_ctx != old_ctx:
+        events.append(
+            (
+                EVENT_CONTEXT_CHANGED,
+                {
+                    "context_type": new.context_type if new else None,
+                    "context_uri": new_ctx,
+                    "previous_context_uri": old_ctx,
+                },
+            )
+        )
+
+    was_playing = bool(old and old.is_playing)
+    is_playing = bool(new and new.is_playing)
+    if is_playing != was_playing:
+        current = new if is_playing else old
+        events.append(
+            (
+                EVENT_PLAYBACK_STARTED if is_playing else EVENT_PLAYBACK_STOPPED,
+                {"uri": current.item_uri, "device_id": current.device_id},
+            )
+        )
+
+    return events
+
+
+def _with_active_device(
+    devices: list[SpotifyDevice], player: PlayerState | None
+) -> list[SpotifyDevice]:
+    active_id = player.device_id if player else None
+    out = [
+        d if d.is_active == (d.id == active_id) else replace(d, is_active=d.id == active_id)
+        for d in devices
+    ]
+    if active_id and all(d.id != active_id for d in devices):
+        out.append(SpotifyDevice(id=active_id, name=player.device_name or active_id, is_active=True))
+    return out
 
 
 class SpotifyCoordinator(DataUpdateCoordinator[SpotifyData]):
@@ -27,62 +147,454 @@ class SpotifyCoordinator(DataUpdateCoordinator[SpotifyData]):
         self,
         hass: HomeAssistant,
         api: SpotifyApi,
-        oauth: config_entry_oauth2_flow.OAuth2Session,
+        full_liked_songs: bool = False,
     ) -> None:
         super().__init__(
             hass,
-            logger=__import__("logging").getLogger(__name__),
+            logger=_LOGGER,
             name="Spotify Playlist Select",
             update_interval=timedelta(seconds=15),
         )
         self.api = api
-        self.oauth = oauth
         self._static_loaded = False
+        self.library_updated_at: float | None = None
+        self._library_task: asyncio.Task[None] | None = None
+        self._library_failures = 0
+        self._library_retry: CALLBACK_TYPE | None = None
+
+        self._playlists: list[SpotifyPlaylist] = []
+        self._playlist_tracks: dict[str, list[SpotifyTrack]] = {}
+        # Reverse index: track URI -> ids of the (cached part of the)
+        # playlists containing it, updated per playlist as tracks load.
+        self._track_playlists: dict[str, set[str]] = {}
+        self._playlists_by_id: dict[str, SpotifyPlaylist] = {}
+        self._saved_tracks: list[SpotifyTrack] = []
+        self._recent_tracks: list[SpotifyRecentItem] = []
+
+        # Connect devices rarely change; the active one comes from the player
+        # poll, the full list is refetched on TTL expiry or when a command
+        # hits a device Spotify no longer knows.
+        self._devices: list[SpotifyDevice] = []
+        self._devices_fetched_at: float | None = None
+
+        self.sections: dict[str, SectionStatus] = {
+            name: SectionStatus() for name in SECTION_TIMEOUTS
+        }
+        scale = api.request_timeout / DEFAULT_REQUEST_TIMEOUT
+        self._section_timeouts = {
+            name: timeout * scale for name, timeout in SECTION_TIMEOUTS.items()
+        }
+
+        # The complete Liked Songs library, streamed page by page in the
+        # background when enabled; saved_tracks stays capped for the select.
+        self.full_liked_songs = full_liked_songs
+        self.liked_songs: list[SpotifyTrack] | None = None
+        self._liked_songs_task: asyncio.Task[None] | None = None
+
+        # Next item in the queue, fetched shortly before the current one
+        # ends so its metadata and artwork are ready at the transition.
+        self.upcoming: UpcomingTrack | None = None
+        # Player state as last polled. Bus events compare polls only, so a
+        # predicted transition shown early never fires events of its own.
+        self._polled_player: PlayerState | None = None
+        self._upcoming_for: str | None = None
+        self.artwork_prefetch: Callable[[str], Awaitable[None]] | None = None
+        self._track_timers: list[CALLBACK_TYPE] = []
+
+    def _set_playlist_tracks(self, playlist_id: str, tracks: list[SpotifyTrack] | None) -> None:
+        old = {t.uri for t in self._playlist_tracks.get(playlist_id, ())}
+        new = {t.uri for t in tracks or ()}
+
+        for uri in old - new:
+            ids = self._track_playlists.get(uri)
+            if ids is not None:
+                ids.discard(playlist_id)
+                if not ids:
+                    del self._track_playlists[uri]
+        for uri in new - old:
+            self._track_playlists.setdefault(uri, set()).add(playlist_id)
+
+        if tracks is None:
+            self._playlist_tracks.pop(playlist_id, None)
+        else:
+            self._playlist_tracks[playlist_id] = tracks
+
+    def playlists_for_track(self, uri: str | None) -> list[SpotifyPlaylist]:
+        ids = self._track_playlists.get(uri) if uri else None
+        if not ids:
+            return []
+        by_id = self._playlists_by_id
+        return sorted(
+            (by_id[pid] for pid in ids if pid in by_id), key=lambda pl: pl.name.casefold()
+        )
+
+    @property
+    def library_stale(self) -> bool:
+        if self.library_updated_at is None:
+            return False
+        return monotonic() - self.library_updated_at > LIBRARY_STALE_SECONDS
+
+    @property
+    def library_fresh(self) -> bool:
+        return self.library_updated_at is not None and not self.library_stale
+
+    @property
+    def library_loading(self) -> bool:
+        return self._library_task is not None and not self._library_task.done()
+
+    def _snapshot(self, devices: list[SpotifyDevice], player: PlayerState | None) -> SpotifyData:
+        return SpotifyData(
+            devices=devices,
+            playlists=self._playlists,
+            saved_tracks=self._saved_tracks,
+            recent_tracks=self._recent_tracks,
+            playlist_tracks=dict(self._playlist_tracks),
+            player=player,
+        )
 
     async def _async_update_data(self) -> SpotifyData:
+        breaker = self.api.breaker
+        if breaker.state == CIRCUIT_OPEN and not breaker.probe_due:
+            raise UpdateFailed(
+                f"Spotify API unavailable, next attempt in {breaker.retry_in:.0f}s"
+            )
+
+        try:
+            with self.api.tracer.span("refresh", "coordinator"):
+                data = await self._async_fetch_snapshot()
+        except SpotifyAuthError as err:
+            raise ConfigEntryAuthFailed(str(err)) from err
+
+        if self.data is not None:
+            for event_type, payload in _player_events(self._polled_player, data.player):
+                self.hass.bus.async_fire(event_type, payload)
+        self._polled_player = data.player
+
+        self._schedule_track_end(data.player)
+        return data
+
+    def _section_failed(self, name: str, err: Exception) -> None:
+        status = self.sections[name]
+        status.error = str(err) or type(err).__name__
+        status.failures += 1
+        _LOGGER.debug("Refreshing %s failed, keeping last value: %s", name, status.error)
+
+    async def _async_section(
+        self, name: str, fetch: Callable[[], Awaitable[_T]], fallback: _T
+    ) -> _T:
+        status = self.sections[name]
         try:
-            await self.oauth.async_ensure_token_valid()
-            self.api.set_token(self.oauth.token["access_token"])
-
-            if not self._static_loaded:
-                playlists = await self.api.get_playlists()
-                playlist_tracks: dict[str, list[SpotifyTrack]] = {}
-                for pl in playlists:
-                    playlist_tracks[pl.id] = await self.api.get_playlist_tracks(
-                        pl.id, limit_total=TRACK_LIMIT_PER_PLAYLIST
-                    )
-                self._static_loaded = True
-            else:
-                playlists = self.data.playlists if self.data else []
-                playlist_tracks = self.data.playlist_tracks if self.data else {}
-
-            devices = await self.api.get_devices()
-
-            player_data = await self.api.get_player()
-            player = player_data if player_data else None
+            with self.api.tracer.span(name):
+                async with asyncio.timeout(self._section_timeouts[name]):
+                    value = await fetch()
+        except SpotifyAuthError:
+            raise
+        except Exception as err:
+            self._section_failed(name, err)
+            return fallback
+
+        status.updated_at = time()
+        status.error = None
+        status.failures = 0
+        return value
 
+    async def _async_fetch_snapshot(self) -> SpotifyData:
+        # Each section has its own timeout and keeps its last good value on
+        # failure, so one slow endpoint neither blocks nor blanks the rest.
+        sections: dict[str, tuple[Callable[[], Awaitable[Any]], Any]] = {
+            SECTION_PLAYER: (self.api.get_player, self._polled_player),
+        }
+        if (
+            self._devices_fetched_at is None
+            or monotonic() - self._devices_fetched_at > DEVICES_TTL_SECONDS
+        ):
+            sections[SECTION_DEVICES] = (self.api.get_devices, self._devices)
+
+        # Liked Songs and Recently Played are loaded with the library;
+        # until then the first refresh only needs devices and player.
+        if self._static_loaded:
+            sections[SECTION_SAVED_TRACKS] = (
+                partial(self.api.get_saved_tracks, limit=SAVED_TRACKS_LIMIT),
+                self._saved_tracks,
+            )
+            sections[SECTION_RECENT_TRACKS] = (
+                partial(self.api.get_recently_played, limit=RECENTLY_PLAYED_LIMIT),
+                self._recent_tracks,
+            )
+
+        results: dict[str, Any] = {}
+        if self.api.breaker.state != CIRCUIT_CLOSED:
+            # A half-open breaker lets a single probe through; send the
+            # player request on its own and only fan out once it closed.
+            fetch, fallback = sections.pop(SECTION_PLAYER)
+            results[SECTION_PLAYER] = await self._async_section(SECTION_PLAYER, fetch, fallback)
+            if self.api.breaker.state != CIRCUIT_CLOSED:
+                sections = {}
+
+        names = list(sections)
+        values = await asyncio.gather(
+            *(self._async_section(name, *sections[name]) for name in names)
+        )
+        results.update(zip(names, values))
+
+        failed = [name for name in results if self.sections[name].error]
+        if len(failed) == len(results) or (self.data is None and failed):
+            raise UpdateFailed(
+                "; ".join(f"{name}: {self.sections[name].error}" for name in failed)
+            )
+
+        # All sections are in; apply them together so the snapshot is
+        # consistent.
+        if SECTION_DEVICES in results:
+            self._devices = results[SECTION_DEVICES]
+            if self.sections[SECTION_DEVICES].error is None:
+                self._devices_fetched_at = monotonic()
+        self._saved_tracks = results.get(SECTION_SAVED_TRACKS, self._saved_tracks)
+        self._recent_tracks = results.get(SECTION_RECENT_TRACKS, self._recent_tracks)
+        player = results[SECTION_PLAYER]
+
+        if player and player.device_id and all(d.id != player.device_id for d in self._devices):
+            # Playing on a device we have not listed yet; pick up its
+            # details on the next poll.
+            self._devices_fetched_at = None
+
+        return self._snapshot(_with_active_device(self._devices, player), player)
+
+    def _cancel_track_timers(self) -> None:
+        while self._track_timers:
+            self._track_timers.pop()()
+
+    def _schedule_track_end(self, player: PlayerState | None) -> None:
+        self._cancel_track_timers()
+
+        current_uri = player.item_uri if player else None
+        if self._upcoming_for != current_uri:
+            self.upcoming = None
+            self._upcoming_for = None
+
+        if not player or not player.is_playing or not player.duration_ms or player.progress_ms is None:
+            return
+
+        remaining = max(0.0, (player.duration_ms - player.progress_ms) / 1000)
+        if self._upcoming_for is None:
+            self._track_timers.append(
+                async_call_later(
+                    self.hass,
+                    max(0.0, remaining - UPCOMING_PREFETCH_LEAD),
+                    self._async_prefetch_upcoming,
+                )
+            )
+        self._track_timers.append(
+            async_call_later(self.hass, remaining + TRACK_END_MARGIN, self._async_track_ended)
+        )
+
+    async def _async_prefetch_upcoming(self, _now: Any) -> None:
+        player = self.data.player if self.data else None
+        if not player or not player.item_uri:
+            return
+
+        try:
+            upcoming = await self.api.get_upcoming()
+        except Exception as err:
+            _LOGGER.debug("Fetching the upcoming track failed: %s", err)
+            return
+
+        self.upcoming = upcoming
+        self._upcoming_for = player.item_uri
+        self.async_update_listeners()
+
+        if upcoming and upcoming.image_url and self.artwork_prefetch:
+            await self.artwork_prefetch(upcoming.image_url)
+
+    async def _async_track_ended(self, _now: Any) -> None:
+        player = self.data.player if self.data else None
+        upcoming = self.upcoming
+        if (
+            player
+            and upcoming
+            and self._upcoming_for == player.item_uri
+            and player.repeat_state != "track"
+        ):
+            # Publish the prefetched item right away; the refresh below
+            # confirms (or corrects) it and fires the events.
+            new = replace(
+                player,
+                item_type=upcoming.item_type,
+                item_uri=upcoming.uri,
+                item_name=upcoming.name,
+                duration_ms=upcoming.duration_ms,
+                artists=upcoming.artists,
+                album_name=upcoming.album_name,
+                album_uri=upcoming.album_uri,
+                images=upcoming.images,
+                progress_ms=0,
+                timestamp=int(time() * 1000),
+            )
+            self.async_set_updated_data(replace(self.data, player=new))
+
+        await self.async_request_refresh()
+
+    async def async_refresh_devices(self) -> list[SpotifyDevice]:
+        self._devices = await self.api.get_devices()
+        self._devices_fetched_at = monotonic()
+        if self.data is not None:
+            self.async_set_updated_data(
+                replace(self.data, devices=_with_active_device(self._devices, self.data.player))
+            )
+        return self._devices
+
+    async def async_request_devices_refresh(self) -> None:
+        self._devices_fetched_at = None
+        await self.async_request_refresh()
+
+    async def async_device_call(
+        self,
+        device_id: str | None,
+        func: Callable[..., Awaitable[_T]],
+        *args: Any,
+        span: str | None = None,
+    ) -> _T:
+        tracer = self.api.tracer
+        name = span or getattr(func, "__name__", "command")
+        with tracer.span(name, "command", device_id=device_id):
             try:
-                saved_tracks = await self.api.get_saved_tracks(limit=SAVED_TRACKS_LIMIT)
-            except Exception:
-                saved_tracks = []
+                return await func(*args)
+            except SpotifyApiError as err:
+                if err.status != 404:
+                    raise
+                _LOGGER.debug("Device %s not found, refreshing device list", device_id)
+                tracer.annotate(device_refresh=True)
+                devices = await self.async_refresh_devices()
+                if device_id and all(d.id != device_id for d in devices):
+                    raise
+            return await func(*args)
+
+    async def async_execute_plan(self, device_id: str | None, plan: list[PlannedCall]) -> None:
+        # Each call gets its own device retry, so a 404 halfway through a
+        # plan does not replay the calls that already went through.
+        for call in plan:
+            await self.async_device_call(device_id, getattr(self.api, call.method), *call.args)
+
+    def _cancel_library_retry(self) -> None:
+        if self._library_retry is not None:
+            self._library_retry()
+            self._library_retry = None
+
+    def _schedule_library_retry(self) -> None:
+        self._cancel_library_retry()
+        delay = min(LIBRARY_RETRY_MAX, LIBRARY_RETRY_BASE * 2 ** self._library_failures)
+        self._library_failures += 1
+        _LOGGER.debug("Retrying the library load in %.0fs", delay)
+        self._library_retry = async_call_later(self.hass, delay, self._retry_library)
+
+    @callback
+    def _retry_library(self, _now: Any) -> None:
+        self._library_retry = None
+        self.async_start_library_load()
+
+    def async_start_library_load(self) -> asyncio.Task[None]:
+        self._cancel_library_retry()
+        if not self.library_loading:
+            self._library_task = self.hass.async_create_background_task(
+                self._async_load_library(), name=f"{DOMAIN} library load"
+            )
+        return self._library_task
 
+    async def _async_load_library(self) -> None:
+        last_push = monotonic()
+
+        def _push(force: bool = False) -> None:
+            nonlocal last_push
+            if self.data is None:
+                return
+            if not force and monotonic() - last_push < LIBRARY_PUSH_INTERVAL:
+                return
+            last_push = monotonic()
+            # Not async_set_updated_data: that would reset the poll timer on
+            # every push and delay player updates for as long as we load.
+            self.data = replace(
+                self.data,
+                playlists=self._playlists,
+                playlist_tracks=dict(self._playlist_tracks),
+                saved_tracks=self._saved_tracks,
+                recent_tracks=self._recent_tracks,
+            )
+            self.async_update_listeners()
+
+        tracer = self.api.tracer
+        with tracer.span("library", "coordinator"):
             try:
-                recent_tracks = await self.api.get_recently_played(limit=RECENTLY_PLAYED_LIMIT)
-            except Exception:
-                recent_tracks = []
-
-            return SpotifyData(
-                devices=devices,
-                playlists=playlists,
-                saved_tracks=saved_tracks,
-                recent_tracks=recent_tracks,
-                playlist_tracks=playlist_tracks,
-                player=player,
+                with tracer.span("playlists"):
+                    self._playlists = await self.api.get_playlists()
+                self._playlists_by_id = {pl.id: pl for pl in self._playlists}
+                known = self._playlists_by_id
+                for playlist_id in list(self._playlist_tracks):
+                    if playlist_id not in known:
+                        self._set_playlist_tracks(playlist_id, None)
+                _push(force=True)
+
+                for pl in self._playlists:
+                    with tracer.span("playlist_tracks", playlist_id=pl.id):
+                        tracks = await self.api.get_playlist_tracks(
+                            pl.id, limit_total=TRACK_LIMIT_PER_PLAYLIST
+                        )
+                    self._set_playlist_tracks(pl.id, tracks)
+                    _push()
+
+                # A failure here keeps the previous lists and shows up in
+                # the section status like a failed poll would.
+                self._saved_tracks = await self._async_section(
+                    SECTION_SAVED_TRACKS,
+                    partial(self.api.get_saved_tracks, limit=SAVED_TRACKS_LIMIT),
+                    self._saved_tracks,
+                )
+
+                self._recent_tracks = await self._async_section(
+                    SECTION_RECENT_TRACKS,
+                    partial(self.api.get_recently_played, limit=RECENTLY_PLAYED_LIMIT),
+                    self._recent_tracks,
+                )
+            except Exception as err:
+                _LOGGER.warning("Loading the Spotify library failed: %s", err)
+                _push(force=True)
+                self._schedule_library_retry()
+                return
+
+            self._library_failures = 0
+            self._static_loaded = True
+            self.library_updated_at = monotonic()
+            _push(force=True)
+
+        # The complete library can take minutes to page through; it runs on
+        # its own so the library load (and its retry) does not wait for it.
+        if self.full_liked_songs and (
+            self._liked_songs_task is None or self._liked_songs_task.done()
+        ):
+            self._liked_songs_task = self.hass.async_create_background_task(
+                self._async_sync_liked_songs(), name=f"{DOMAIN} liked songs sync"
             )
 
+    async def _async_sync_liked_songs(self) -> None:
+        tracks: list[SpotifyTrack] = []
+        try:
+            with self.api.tracer.span("liked_songs", "coordinator"):
+                async for page in self.api.iter_saved_tracks():
+                    tracks.extend(page)
         except Exception as err:
-            raise UpdateFailed(str(err)) from err
+            # Keep the previous complete list; the next library load retries.
+            _LOGGER.warning("Syncing Liked Songs failed after %d tracks: %s", len(tracks), err)
+            return
+        self.liked_songs = tracks
+        self.async_update_listeners()
 
     async def async_refresh_library(self) -> None:
-        self._static_loaded = False
-        await self.async_request_refresh()
+        await self.async_start_library_load()
+
+    async def async_shutdown(self) -> None:
+        self._cancel_track_timers()
+        self._cancel_library_retry()
+        if self.library_loading:
+            self._library_task.cancel()
+        if self._liked_songs_task is not None and not self._liked_songs_task.done():
+            self._liked_songs_task.cancel()
+        await super().async_shutdown()
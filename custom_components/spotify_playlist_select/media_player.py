@@ -1,8 +1,12 @@
 from __future__ import annotations
 
+import asyncio
+from collections.abc import Awaitable
 from time import monotonic
 from typing import Any, Optional
 
+import aiohttp
+
 from homeassistant.components.media_player import MediaPlayerEntity, MediaPlayerEntityFeature
 from homeassistant.components.media_player.const import MediaPlayerState, MediaType, RepeatMode
 from homeassistant.config_entries import ConfigEntry
@@ -12,9 +16,10 @@ from homeassistant.helpers.update_coordinator import CoordinatorEntity
 from homeassistant.util import dt as dt_util
 
 from .api import SpotifyApiError
-from .const import DOMAIN, CONF_SELECTED_PLAYLIST_IDS
+from .const import DOMAIN, CONF_ARTWORK_THUMBNAIL_SIZE, CONF_SELECTED_PLAYLIST_IDS
 from .coordinator import SpotifyCoordinator
 from .device import spotify_device_info
+from .planner import PlannedCall, plan_play
 
 def _device_label(name: str, device_id: str) -> str:
     return f"{name} [{device_id[:6]}]"
@@ -43,7 +48,10 @@ class SpotifyPlaylistMediaPlayer(CoordinatorEntity[SpotifyCoordinator], MediaPla
         | MediaPlayerEntityFeature.REPEAT_SET
         | MediaPlayerEntityFeature.SELECT_SOURCE
         | MediaPlayerEntityFeature.SELECT_SOUND_MODE
+        | MediaPlayerEntityFeature.VOLUME_SET
+        | MediaPlayerEntityFeature.VOLUME_STEP
     )
+    _attr_volume_step = 0.05
 
     def __init__(self, hass: HomeAssistant, entry: ConfigEntry, coordinator: SpotifyCoordinator) -> None:
         super().__init__(coordinator)
@@ -54,6 +62,12 @@ class SpotifyPlaylistMediaPlayer(CoordinatorEntity[SpotifyCoordinator], MediaPla
         self._last_command_ts: float = 0.0
         self._debounce_seconds: float = 0.5
 
+    async def async_added_to_hass(self) -> None:
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            self._runtime()["volume"].async_add_listener(self.async_write_ha_state)
+        )
+
     def _debounce(self) -> bool:
         now = monotonic()
         if now - self._last_command_ts < self._debounce_seconds:
@@ -68,18 +82,20 @@ class SpotifyPlaylistMediaPlayer(CoordinatorEntity[SpotifyCoordinator], MediaPla
         val = self._runtime().get("selected_device_id")
         return val if isinstance(val, str) else None
 
-    async def _refresh_token(self) -> None:
-        oauth = self._runtime()["oauth"]
-        await oauth.async_ensure_token_valid()
+    async def _call_spotify(self, method: str, *args: Any) -> None:
         api = self._runtime()["api"]
-        api.set_token(oauth.token["access_token"])
+        await self._await_spotify(
+            self.coordinator.async_device_call(
+                self._selected_device_id(), getattr(api, method), *args
+            )
+        )
 
-    async def _call_spotify(self, func, *args, **kwargs) -> None:
-        await self._refresh_token()
-        api = self._runtime()["api"]
+    async def _call_plan(self, device_id: str, plan: list[PlannedCall]) -> None:
+        await self._await_spotify(self.coordinator.async_execute_plan(device_id, plan))
 
+    async def _await_spotify(self, call: Awaitable[Any]) -> None:
         try:
-            await func(api, *args, **kwargs)
+            await call
         except SpotifyApiError as err:
             if getattr(err, "status", None) == 403:
                 await self.coordinator.async_request_refresh()
@@ -114,13 +130,13 @@ class SpotifyPlaylistMediaPlayer(CoordinatorEntity[SpotifyCoordinator], MediaPla
         if not device_id:
             return
 
-        async def _do(api, device_id):
-            await api.transfer_playback(device_id, play=True)
-
-        await self._call_spotify(_do, device_id)
+        plan = plan_play(self.coordinator.data.player, device_id)
+        if plan:
+            await self._call_plan(device_id, plan)
 
         self._runtime()["selected_device_id"] = device_id
         self.async_write_ha_state()
+        await self.coordinator.async_request_devices_refresh()
 
 
     @property
@@ -135,15 +151,21 @@ class SpotifyPlaylistMediaPlayer(CoordinatorEntity[SpotifyCoordinator], MediaPla
 
     @property
     def source(self) -> str | None:
-        player = self.coordinator.data.player or {}
-        ctx = (player.get("context") or {})
-        if ctx.get("type") != "playlist":
-            return None
-        uri = ctx.get("uri") 
-        if not uri:
+        player = self.coordinator.data.player
+        if not player:
             return None
-        playlist_id = uri.split(":")[-1]
-        pl = next((p for p in self.coordinator.data.playlists if p.id == playlist_id), None)
+        if player.context_type == "playlist" and player.context_uri:
+            playlist_id = player.context_uri.split(":")[-1]
+            pl = next((p for p in self.coordinator.data.playlists if p.id == playlist_id), None)
+            return pl.name if pl else None
+
+        # Playing from an album, radio etc.: name a selected playlist that
+        # contains the current track, if any.
+        selected = set(self.entry.options.get(CONF_SELECTED_PLAYLIST_IDS) or self.entry.data.get(CONF_SELECTED_PLAYLIST_IDS, []) or [])
+        pl = next(
+            (p for p in self.coordinator.playlists_for_track(player.item_uri) if p.id in selected),
+            None,
+        )
         return pl.name if pl else None
 
     async def async_select_source(self, source: str) -> None:
@@ -161,98 +183,111 @@ class SpotifyPlaylistMediaPlayer(CoordinatorEntity[SpotifyCoordinator], MediaPla
         if not pl:
             return
 
-        async def _do(api, device_id, playlist_id):
-            await api.start_playlist(device_id, playlist_id)
-
-        await self._call_spotify(_do, device_id, pl.id)
+        await self._call_spotify("start_playlist", device_id, pl.id)
 
     @property
     def state(self) -> MediaPlayerState | None:
         player = self.coordinator.data.player
         if not player:
             return None
-        return MediaPlayerState.PLAYING if player.get("is_playing") else MediaPlayerState.PAUSED
+        return MediaPlayerState.PLAYING if player.is_playing else MediaPlayerState.PAUSED
 
     @property
     def media_title(self) -> str | None:
-        item = (self.coordinator.data.player or {}).get("item") or {}
-        return item.get("name")
+        player = self.coordinator.data.player
+        return player.item_name if player else None
 
     @property
     def media_artist(self) -> str | None:
-        item = (self.coordinator.data.player or {}).get("item") or {}
-        artists = item.get("artists") or []
-        if not artists:
-            return None
-        return ", ".join(a.get("name", "") for a in artists if a.get("name"))
+        player = self.coordinator.data.player
+        return player.artist if player else None
 
     @property
     def media_album_name(self) -> str | None:
-        item = (self.coordinator.data.player or {}).get("item") or {}
-        album = item.get("album") or {}
-        return album.get("name")
+        player = self.coordinator.data.player
+        return player.album_name if player else None
 
     @property
     def media_image_url(self) -> str | None:
-        item = (self.coordinator.data.player or {}).get("item") or {}
-        album = item.get("album") or {}
-        images = album.get("images") or []
-        return images[0].get("url") if images else None
+        player = self.coordinator.data.player
+        return player.image_url if player else None
+
+    async def async_get_media_image(self) -> tuple[bytes | None, str | None]:
+        url = self.media_image_url
+        if not url:
+            return None, None
+
+        size = int(self.entry.options.get(CONF_ARTWORK_THUMBNAIL_SIZE) or 0) or None
+        try:
+            result = await self._runtime()["artwork"].async_get(url, size)
+        except (aiohttp.ClientError, asyncio.TimeoutError, OSError):
+            return None, None
+        return result if result else (None, None)
 
     @property
     def media_content_type(self) -> str | None:
-        player = self.coordinator.data.player or {}
-        item = player.get("item") or {}
-        if item.get("type") == "episode":
+        player = self.coordinator.data.player
+        item_type = player.item_type if player else None
+        if item_type == "episode":
             return MediaType.PODCAST
-        if item.get("type") == "track":
+        if item_type == "track":
             return MediaType.MUSIC
         return None
 
     @property
     def media_duration(self) -> int | None:
-        item = (self.coordinator.data.player or {}).get("item") or {}
-        dur_ms = item.get("duration_ms")
+        player = self.coordinator.data.player
+        dur_ms = player.duration_ms if player else None
         return int(dur_ms / 1000) if dur_ms else None
 
     @property
     def media_position(self) -> int | None:
-        player = self.coordinator.data.player or {}
-        prog_ms = player.get("progress_ms")
-        if prog_ms is None:
+        player = self.coordinator.data.player
+        if not player or player.progress_ms is None:
             return None
 
-        pos = int(prog_ms / 1000)
+        pos = int(player.progress_ms / 1000)
 
-        dur = self.media_duration
-        if dur is not None:
-            pos = max(0, min(pos, dur))
+        if player.duration_ms:
+            pos = max(0, min(pos, int(player.duration_ms / 1000)))
 
         return pos
 
     @property
     def media_position_updated_at(self):
-        if self.media_position is None:
+        player = self.coordinator.data.player
+        if not player or player.progress_ms is None:
             return None
 
-        player = self.coordinator.data.player or {}
-        ts = player.get("timestamp")
-        if not ts:
+        if not player.timestamp:
             return self.coordinator.last_update_success
 
-        return dt_util.utc_from_timestamp(ts / 1000)
+        return dt_util.utc_from_timestamp(player.timestamp / 1000)
+
 
+    @property
+    def volume_level(self) -> float | None:
+        volume = self._runtime()["volume"].current_volume()
+        return volume / 100 if volume is not None else None
+
+    async def async_set_volume_level(self, volume: float) -> None:
+        player = self.coordinator.data.player
+        device_id = player.device_id if player and player.device_id else self._selected_device_id()
+        # Coalesced and rate limited by the controller; no debounce here so
+        # slider drags always land on the final value.
+        self._runtime()["volume"].async_set(round(volume * 100), device_id)
 
     @property
     def shuffle(self) -> bool | None:
-        player = self.coordinator.data.player or {}
+        player = self.coordinator.data.player
         if not player:
             return None
-        return bool(player.get("shuffle_state"))
+        return player.shuffle_state
 
     @property
     def repeat(self) -> RepeatMode | None:
-        rep = (self.coordinator.data.player or {}).get("repeat_state")
+        player = self.coordinator.data.player
+        rep = player.repeat_state if player else None
         if rep == "track":
             return RepeatMode.ONE
         if rep == "context":
@@ -269,12 +304,9 @@ class SpotifyPlaylistMediaPlayer(CoordinatorEntity[SpotifyCoordinator], MediaPla
         if not device_id:
             return
 
-        async def _do(api, device_id):
-            await api.transfer_playback(device_id, play=True)
-
-            await api.resume(device_id)
-
-        await self._call_spotify(_do, device_id)
+        plan = plan_play(self.coordinator.data.player, device_id)
+        if plan:
+            await self._call_plan(device_id, plan)
 
 
     async def async_media_pause(self) -> None:
@@ -282,40 +314,28 @@ class SpotifyPlaylistMediaPlayer(CoordinatorEntity[SpotifyCoordinator], MediaPla
             return
         device_id = self._selected_device_id()
 
-        async def _do(api, device_id):
-            await api.pause(device_id)
-
-        await self._call_spotify(_do, device_id)
+        await self._call_spotify("pause", device_id)
 
     async def async_media_next_track(self) -> None:
         if not self._debounce():
             return
         device_id = self._selected_device_id()
 
-        async def _do(api, device_id):
-            await api.next_track(device_id)
-
-        await self._call_spotify(_do, device_id)
+        await self._call_spotify("next_track", device_id)
 
     async def async_media_previous_track(self) -> None:
         if not self._debounce():
             return
         device_id = self._selected_device_id()
 
-        async def _do(api, device_id):
-            await api.previous_track(device_id)
-
-        await self._call_spotify(_do, device_id)
+        await self._call_spotify("previous_track", device_id)
 
     async def async_set_shuffle(self, shuffle: bool) -> None:
         if not self._debounce():
             return
         device_id = self._selected_device_id()
 
-        async def _do(api, shuffle, device_id):
-            await api.set_shuffle(shuffle, device_id)
-
-        await self._call_spotify(_do, shuffle, device_id)
+        await self._call_spotify("set_shuffle", shuffle, device_id)
 
     async def async_set_repeat(self, repeat: RepeatMode) -> None:
         if not self._debounce():
@@ -329,10 +349,7 @@ class SpotifyPlaylistMediaPlayer(CoordinatorEntity[SpotifyCoordinator], MediaPla
         else:
             state = "off"
 
-        async def _do(api, state, device_id):
-            await api.set_repeat(state, device_id)
-
-        await self._call_spotify(_do, state, device_id)
+        await self._call_spotify("set_repeat", state, device_id)
 
     @property
     def device_info(self):
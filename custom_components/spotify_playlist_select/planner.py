@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any
+
+from .api import PlayerState
+
+
+@dataclass(frozen=True)
+class PlannedCall:
+    method: str
+    args: tuple[Any, ...] = ()
+
+
+def plan_play(player: PlayerState | None, device_id: str) -> list[PlannedCall]:
+    if player and player.device_id == device_id:
+        if player.is_playing:
+            return []
+        return [PlannedCall("resume", (device_id,))]
+    # Transferring with play=True already starts playback on the target.
+    return [PlannedCall("transfer_playback", (device_id, True))]
+
+
+def plan_play_playlist_track(
+    player: PlayerState | None,
+    device_id: str,
+    playlist_id: str,
+    track_uri: str,
+    queue_mode: bool,
+    first_track_uri: str | None = None,
+) -> list[PlannedCall]:
+    start_at_track = [PlannedCall("start_playlist_at_track", (device_id, playlist_id, track_uri))]
+
+    if not queue_mode or not player:
+        return start_at_track
+
+    queue_and_skip = [
+        PlannedCall("add_to_queue", (device_id, track_uri)),
+        PlannedCall("next_track", (device_id,)),
+    ]
+
+    if player.device_id == device_id and player.context_uri == f"spotify:playlist:{playlist_id}":
+        return queue_and_skip
+
+    # Starting at the track only differs from "start playlist, queue, skip"
+    # in where the playlist continues afterwards. With shuffle on, or when
+    # the track is the playlist's first one, both end up in the same place.
+    if player.shuffle_state or track_uri == first_track_uri:
+        return start_at_track
+
+    return [PlannedCall("start_playlist", (device_id, playlist_id)), *queue_and_skip]
+
+
+def plan_play_track(
+    player: PlayerState | None,
+    device_id: str,
+    track_uri: str,
+    queue_mode: bool,
+) -> list[PlannedCall]:
+    if queue_mode and player:
+        return [
+            PlannedCall("add_to_queue", (device_id, track_uri)),
+            PlannedCall("next_track", (device_id,)),
+        ]
+    return [PlannedCall("start_playback", (device_id, track_uri))]
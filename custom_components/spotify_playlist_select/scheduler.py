@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from time import monotonic
+from typing import Any
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_point_in_utc_time
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    SCHEDULE_KEEPALIVE_LEAD,
+    SCHEDULE_SOUND_POLL_INTERVAL,
+    SCHEDULE_SOUND_TIMEOUT,
+    SCHEDULE_WARM_UP_LEAD,
+)
+from .coordinator import SpotifyCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+
+@dataclass
+class ScheduledPlayback:
+    at: datetime
+    device_id: str
+    context_uri: str | None = None
+    uris: list[str] | None = None
+    volume: int | None = None
+    warmed_up: bool = False
+
+
+class PlaybackScheduler:
+    def __init__(self, hass: HomeAssistant, coordinator: SpotifyCoordinator) -> None:
+        self.hass = hass
+        self.coordinator = coordinator
+        self.pending: ScheduledPlayback | None = None
+        self.last_result: dict[str, Any] | None = None
+        self._unsubs: list[CALLBACK_TYPE] = []
+
+    @callback
+    def async_schedule(self, playback: ScheduledPlayback) -> None:
+        self.async_cancel()
+        self.pending = playback
+
+        # Wake the device well ahead, touch the API again just before so
+        # the pooled connection is warm, then fire exactly on time.
+        for lead, action in (
+            (SCHEDULE_WARM_UP_LEAD, self._async_warm_up),
+            (SCHEDULE_KEEPALIVE_LEAD, self._async_keep_warm),
+            (0, self._async_fire),
+        ):
+            self._unsubs.append(
+                async_track_point_in_utc_time(
+                    self.hass, action, playback.at - timedelta(seconds=lead)
+                )
+            )
+        self.coordinator.async_update_listeners()
+
+    @callback
+    def async_cancel(self) -> None:
+        while self._unsubs:
+            self._unsubs.pop()()
+        if self.pending is not None:
+            self.pending = None
+            self.coordinator.async_update_listeners()
+
+    async def _async_warm_up(self, _now: datetime) -> None:
+        playback = self.pending
+        if playback is None:
+            return
+
+        api = self.coordinator.api
+        try:
+            with api.tracer.span("schedule_warm_up", "command", device_id=playback.device_id):
+                await self.coordinator.async_device_call(
+                    playback.device_id, api.transfer_playback, playback.device_id, False
+                )
+                if playback.volume is not None:
+                    await self.coordinator.async_device_call(
+                        playback.device_id, api.set_volume, playback.volume, playback.device_id
+                    )
+                player = await api.get_player()
+        except Exception as err:
+            _LOGGER.warning("Warming up %s for scheduled playback failed: %s", playback.device_id, err)
+            return
+
+        playback.warmed_up = bool(player and player.device_id == playback.device_id)
+        if not playback.warmed_up:
+            _LOGGER.debug("Device %s did not become active during warm-up", playback.device_id)
+
+    async def _async_keep_warm(self, _now: datetime) -> None:
+        if self.pending is None:
+            return
+        try:
+            await self.coordinator.api.async_warm_up()
+        except Exception as err:
+            _LOGGER.debug("Keep-alive before scheduled playback failed: %s", err)
+
+    async def _async_fire(self, _now: datetime) -> None:
+        playback = self.pending
+        if playback is None:
+            return
+        self.pending = None
+        self._unsubs.clear()
+
+        api = self.coordinator.api
+        started = monotonic()
+        result: dict[str, Any] = {
+            "scheduled_for": playback.at.isoformat(),
+            "device_id": playback.device_id,
+            "warmed_up": playback.warmed_up,
+            "fired_late_ms": round((dt_util.utcnow() - playback.at).total_seconds() * 1000),
+        }
+
+        if playback.uris:
+            func, args = api.play_uris, (playback.device_id, playback.uris)
+        elif playback.context_uri:
+            func, args = api.start_context, (playback.device_id, playback.context_uri)
+        else:
+            func, args = api.resume, (playback.device_id,)
+
+        try:
+            await self.coordinator.async_device_call(playback.device_id, func, *args)
+            result["command_ms"] = round((monotonic() - started) * 1000)
+            result["time_to_sound_ms"] = await self._async_time_to_sound(playback.device_id, started)
+        except Exception as err:
+            _LOGGER.warning("Scheduled playback on %s failed: %s", playback.device_id, err)
+            result["error"] = str(err)
+
+        self.last_result = result
+        await self.coordinator.async_request_refresh()
+
+    async def _async_time_to_sound(self, device_id: str, started: float) -> int | None:
+        deadline = started + SCHEDULE_SOUND_TIMEOUT
+        while monotonic() < deadline:
+            player = await self.coordinator.api.get_player()
+            polled = monotonic()
+            if player and player.is_playing and player.device_id == device_id and player.progress_ms:
+                # Sound started progress_ms before this poll returned.
+                return max(0, round((polled - started) * 1000) - player.progress_ms)
+            await asyncio.sleep(SCHEDULE_SOUND_POLL_INTERVAL)
+        return None
@@ -1,6 +1,11 @@
 from __future__ import annotations
 
-from typing import Optional
+import asyncio
+import logging
+from collections import OrderedDict
+from typing import Any, Optional
+
+import aiohttp
 
 from homeassistant.components.select import SelectEntity
 from homeassistant.config_entries import ConfigEntry
@@ -8,18 +13,28 @@ from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from .api import SpotifyPlaylist, SpotifyTrack, SpotifyRecentItem
+from .api import SpotifyApiError, SpotifyPlaylist, SpotifyTrack, SpotifyRecentItem
 from .coordinator import SpotifyCoordinator
 from .device import spotify_device_info
+from .planner import (
+    plan_play,
+    plan_play_playlist_track,
+    plan_play_track,
+)
 from .const import (
     DOMAIN,
     CONF_PLAY_MODE,
     PLAY_MODE_PLAY,
     PLAY_MODE_QUEUE_PLAY,
     CONF_SELECTED_PLAYLIST_IDS,
+    CONF_TRACK_PAGE_SIZE,
+    TRACK_PAGE_CACHE_SIZE,
 )
 
+_LOGGER = logging.getLogger(__name__)
 
+OPTION_PREVIOUS_PAGE = "« Previous page"
+OPTION_NEXT_PAGE = "Next page »"
 
 
 def _device_label(name: str, device_id: str) -> str:
@@ -51,16 +66,26 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_e
         SpotifyRecentlyPlayedSelect(hass, entry, coordinator),
         SpotifyAllPlaylistsSelect(hass, entry, coordinator),
     ]
+    async_add_entities(entities)
 
-    selected = entry.options.get(CONF_SELECTED_PLAYLIST_IDS) or entry.data.get(CONF_SELECTED_PLAYLIST_IDS, [])
-    selected = set(selected or [])
+    selected = _selected_playlist_ids(entry)
+    added: set[str] = set()
 
-    for pl in coordinator.data.playlists:
-        if pl.id not in selected:
-            continue
-        entities.append(SpotifyPlaylistTrackSelect(hass, entry, coordinator, pl))
+    @callback
+    def _add_playlist_entities() -> None:
+        # The library loads in the background, so playlist entities are
+        # added as soon as the playlist list arrives.
+        new_entities: list[SelectEntity] = []
+        for pl in coordinator.data.playlists:
+            if pl.id not in selected or pl.id in added:
+                continue
+            added.add(pl.id)
+            new_entities.append(SpotifyPlaylistTrackSelect(hass, entry, coordinator, pl))
+        if new_entities:
+            async_add_entities(new_entities)
 
-    async_add_entities(entities)
+    _add_playlist_entities()
+    entry.async_on_unload(coordinator.async_add_listener(_add_playlist_entities))
 
 
 
@@ -90,7 +115,9 @@ class SpotifyDeviceSelect(CoordinatorEntity[SpotifyCoordinator], SelectEntity):
                 self.hass.data[DOMAIN][self.entry.entry_id]["selected_device_id"] = d.id
                 self._current_option = option
                 self.async_write_ha_state()
-                return
+                break
+        # The device list is cached; refresh it whenever someone picks from it.
+        await self.coordinator.async_request_devices_refresh()
 
     @callback
     def _handle_coordinator_update(self) -> None:
@@ -136,18 +163,14 @@ class SpotifyTransferPlaybackSelect(CoordinatorEntity[SpotifyCoordinator], Selec
         if not device_id:
             return
 
-        oauth = self.hass.data[DOMAIN][self.entry.entry_id]["oauth"]
-        await oauth.async_ensure_token_valid()
-        api = self.hass.data[DOMAIN][self.entry.entry_id]["api"]
-        api.set_token(oauth.token["access_token"])
-
-        await api.transfer_playback(device_id, play=True)
+        plan = plan_play(self.coordinator.data.player, device_id)
+        await self.coordinator.async_execute_plan(device_id, plan)
 
         self.hass.data[DOMAIN][self.entry.entry_id]["selected_device_id"] = device_id
         self._current_option = option
         self.async_write_ha_state()
 
-        await self.coordinator.async_request_refresh()
+        await self.coordinator.async_request_devices_refresh()
 
 
 class SpotifyAllPlaylistsSelect(CoordinatorEntity[SpotifyCoordinator], SelectEntity):
@@ -197,12 +220,9 @@ class SpotifyAllPlaylistsSelect(CoordinatorEntity[SpotifyCoordinator], SelectEnt
         if not playlist_id:
             return
 
-        oauth = self.hass.data[DOMAIN][self.entry.entry_id]["oauth"]
-        await oauth.async_ensure_token_valid()
         api = self.hass.data[DOMAIN][self.entry.entry_id]["api"]
-        api.set_token(oauth.token["access_token"])
 
-        await api.start_playlist(device_id, playlist_id)
+        await self.coordinator.async_device_call(device_id, api.start_playlist, device_id, playlist_id)
         await self.coordinator.async_request_refresh()
 
     @property
@@ -232,25 +252,110 @@ class SpotifyPlaylistTrackSelect(CoordinatorEntity[SpotifyCoordinator], SelectEn
 
         self._option_to_uri: dict[str, str] = {}
 
+        # Windowed mode: only one page of tracks is exposed as options and
+        # pages are fetched by offset on demand, keeping a few in an LRU.
+        self._page_size = int(entry.options.get(CONF_TRACK_PAGE_SIZE) or 0)
+        self._page = 0
+        self._pages: OrderedDict[int, list[SpotifyTrack]] = OrderedDict()
+        self._total: int | None = None
+
+    @property
+    def _windowed(self) -> bool:
+        return self._page_size > 0
+
+    @property
+    def _page_count(self) -> int:
+        if not self._total:
+            return 1
+        return -(-self._total // self._page_size)
+
+    async def async_added_to_hass(self) -> None:
+        await super().async_added_to_hass()
+        if self._windowed:
+            self.hass.async_create_task(self._async_load_first_page())
+
+    async def _async_load_first_page(self) -> None:
+        try:
+            await self._async_show_page(0)
+        except (SpotifyApiError, aiohttp.ClientError, asyncio.TimeoutError) as err:
+            _LOGGER.debug("Could not load first page of %s: %s", self.playlist.id, err)
+
+    async def _async_fetch_page(self, page: int) -> list[SpotifyTrack]:
+        if page in self._pages:
+            self._pages.move_to_end(page)
+            return self._pages[page]
+
+        api = self.hass.data[DOMAIN][self.entry.entry_id]["api"]
+        tracks, self._total = await api.get_playlist_tracks_page(
+            self.playlist.id, page * self._page_size, self._page_size
+        )
+        self._pages[page] = tracks
+        while len(self._pages) > TRACK_PAGE_CACHE_SIZE:
+            self._pages.popitem(last=False)
+        return tracks
+
+    async def _async_show_page(self, page: int) -> None:
+        page = min(max(page, 0), self._page_count - 1)
+        await self._async_fetch_page(page)
+        self._page = page
+        self._current_option = None
+        self.async_write_ha_state()
+
+    def _page_tracks(self) -> list[SpotifyTrack]:
+        if self._page in self._pages:
+            return self._pages[self._page]
+        if self._page:
+            return []
+        cached = self.coordinator.data.playlist_tracks.get(self.playlist.id, [])
+        return cached[: self._page_size]
+
+    @property
+    def available(self) -> bool:
+        if self._windowed and self._pages:
+            return super().available
+        return super().available and self.playlist.id in self.coordinator.data.playlist_tracks
+
     @property
     def options(self) -> list[str]:
-        tracks = self.coordinator.data.playlist_tracks.get(self.playlist.id, [])
+        if self._windowed:
+            tracks = self._page_tracks()
+        else:
+            tracks = self.coordinator.data.playlist_tracks.get(self.playlist.id, [])
         self._option_to_uri = {}
 
         opts: list[str] = []
+        if self._windowed and self._page > 0:
+            opts.append(OPTION_PREVIOUS_PAGE)
         for t in tracks:
             base = f"{t.name} — {t.artists}"
             label = _dedupe_label(base, self._option_to_uri)
             self._option_to_uri[label] = t.uri
             opts.append(label)
+        if self._windowed and self._page + 1 < self._page_count:
+            opts.append(OPTION_NEXT_PAGE)
 
         return opts
 
+    @property
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        if not self._windowed:
+            return None
+        return {
+            "page": self._page + 1,
+            "pages": self._page_count,
+            "total_tracks": self._total,
+        }
+
     @property
     def current_option(self) -> str | None:
         return self._current_option
 
     async def async_select_option(self, option: str) -> None:
+        if self._windowed and option in (OPTION_PREVIOUS_PAGE, OPTION_NEXT_PAGE):
+            step = 1 if option == OPTION_NEXT_PAGE else -1
+            await self._async_show_page(self._page + step)
+            return
+
         self._current_option = option
         self.async_write_ha_state()
 
@@ -262,30 +367,22 @@ class SpotifyPlaylistTrackSelect(CoordinatorEntity[SpotifyCoordinator], SelectEn
         if not uri:
             return
 
-        oauth = self.hass.data[DOMAIN][self.entry.entry_id]["oauth"]
-        await oauth.async_ensure_token_valid()
-        api = self.hass.data[DOMAIN][self.entry.entry_id]["api"]
-        api.set_token(oauth.token["access_token"])
-
         play_mode = self.entry.data.get(CONF_PLAY_MODE, PLAY_MODE_PLAY)
-
-        if play_mode == PLAY_MODE_PLAY:
-            await api.start_playlist_at_track(device_id, self.playlist.id, uri)
-            await self.coordinator.async_request_refresh()
-            return
-
-        if play_mode == PLAY_MODE_QUEUE_PLAY:
-            player = self.coordinator.data.player
-            if not player:
-                await api.start_playlist_at_track(device_id, self.playlist.id, uri)
-                await self.coordinator.async_request_refresh()
-                return
-
-            await api.start_playlist(device_id, self.playlist.id)
-            await api.add_to_queue(device_id, uri)
-            await api.next_track(device_id)
-            await self.coordinator.async_request_refresh()
-            return
+        if self._windowed and 0 in self._pages:
+            tracks = self._pages[0]
+        else:
+            tracks = self.coordinator.data.playlist_tracks.get(self.playlist.id) or []
+
+        plan = plan_play_playlist_track(
+            self.coordinator.data.player,
+            device_id,
+            self.playlist.id,
+            uri,
+            queue_mode=play_mode == PLAY_MODE_QUEUE_PLAY,
+            first_track_uri=tracks[0].uri if tracks else None,
+        )
+        await self.coordinator.async_execute_plan(device_id, plan)
+        await self.coordinator.async_request_refresh()
 
     @property
     def device_info(self):
@@ -334,24 +431,15 @@ class SpotifyLikedSongsSelect(CoordinatorEntity[SpotifyCoordinator], SelectEntit
         if not uri:
             return
 
-        rt = self.hass.data[DOMAIN][self.entry.entry_id]
-        oauth = rt["oauth"]
-        await oauth.async_ensure_token_valid()
-        api = rt["api"]
-        api.set_token(oauth.token["access_token"])
-
         play_mode = self.entry.data.get(CONF_PLAY_MODE, PLAY_MODE_PLAY)
 
-        if play_mode == PLAY_MODE_PLAY:
-            await api.start_playback(device_id, uri)
-        else:
-            player = self.coordinator.data.player
-            if not player:
-                await api.start_playback(device_id, uri)
-            else:
-                await api.add_to_queue(device_id, uri)
-                await api.next_track(device_id)
-
+        plan = plan_play_track(
+            self.coordinator.data.player,
+            device_id,
+            uri,
+            queue_mode=play_mode != PLAY_MODE_PLAY,
+        )
+        await self.coordinator.async_execute_plan(device_id, plan)
         await self.coordinator.async_request_refresh()
 
     @property
@@ -400,24 +488,15 @@ class SpotifyRecentlyPlayedSelect(CoordinatorEntity[SpotifyCoordinator], SelectE
         if not uri:
             return
 
-        rt = self.hass.data[DOMAIN][self.entry.entry_id]
-        oauth = rt["oauth"]
-        await oauth.async_ensure_token_valid()
-        api = rt["api"]
-        api.set_token(oauth.token["access_token"])
-
         play_mode = self.entry.data.get(CONF_PLAY_MODE, PLAY_MODE_PLAY)
 
-        if play_mode == PLAY_MODE_PLAY:
-            await api.start_playback(device_id, uri)
-        else:
-            player = self.coordinator.data.player
-            if not player:
-                await api.start_playback(device_id, uri)
-            else:
-                await api.add_to_queue(device_id, uri)
-                await api.next_track(device_id)
-
+        plan = plan_play_track(
+            self.coordinator.data.player,
+            device_id,
+            uri,
+            queue_mode=play_mode != PLAY_MODE_PLAY,
+        )
+        await self.coordinator.async_execute_plan(device_id, plan)
         await self.coordinator.async_request_refresh()
 
     @property
@@ -4,9 +4,11 @@ from typing import Any
 
 from homeassistant.components.sensor import SensorEntity
 from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import EntityCategory
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
+from homeassistant.util import dt as dt_util
 
 from .const import DOMAIN
 from .coordinator import SpotifyCoordinator
@@ -19,7 +21,12 @@ async def async_setup_entry(
     async_add_entities: AddEntitiesCallback,
 ) -> None:
     coordinator: SpotifyCoordinator = hass.data[DOMAIN][entry.entry_id]["coordinator"]
-    async_add_entities([SpotifyPlaybackSensor(hass, entry, coordinator)])
+    async_add_entities(
+        [
+            SpotifyPlaybackSensor(hass, entry, coordinator),
+            SpotifyApiStatusSensor(hass, entry, coordinator),
+        ]
+    )
 
 
 class SpotifyPlaybackSensor(CoordinatorEntity[SpotifyCoordinator], SensorEntity):
@@ -43,7 +50,15 @@ class SpotifyPlaybackSensor(CoordinatorEntity[SpotifyCoordinator], SensorEntity)
         player = self.coordinator.data.player
         if not player:
             return "idle"
-        return "playing" if player.get("is_playing") else "paused"
+        return "playing" if player.is_playing else "paused"
+
+    @property
+    def entity_picture(self) -> str | None:
+        player = self.coordinator.data.player
+        if not player or not player.image_url:
+            return None
+        artwork = self.hass.data[DOMAIN][self.entry.entry_id]["artwork"]
+        return artwork.local_url(player.image_url)
 
     @property
     def extra_state_attributes(self) -> dict[str, Any]:
@@ -53,6 +68,10 @@ class SpotifyPlaybackSensor(CoordinatorEntity[SpotifyCoordinator], SensorEntity)
         selected_device_id = runtime.get("selected_device_id")
         data["selected_device_id"] = selected_device_id
 
+        scheduler = runtime["scheduler"]
+        data["next_scheduled_playback"] = scheduler.pending.at.isoformat() if scheduler.pending else None
+        data["last_scheduled_playback"] = scheduler.last_result
+
         devices = self.coordinator.data.devices or []
         data["devices"] = [
             {
@@ -63,47 +82,71 @@ class SpotifyPlaybackSensor(CoordinatorEntity[SpotifyCoordinator], SensorEntity)
             for d in devices
         ]
 
-        player = self.coordinator.data.player or {}
+        player = self.coordinator.data.player
         if not player:
             data["player_available"] = False
             return data
 
         data["player_available"] = True
-        data["is_playing"] = player.get("is_playing")
-        data["shuffle_state"] = player.get("shuffle_state")
-        data["repeat_state"] = player.get("repeat_state")
-        data["progress_ms"] = player.get("progress_ms")
-        data["timestamp"] = player.get("timestamp")
-
-        item = player.get("item") or {}
-        data["item_type"] = item.get("type")
-        data["track_name"] = item.get("name")
-        data["track_uri"] = item.get("uri")
-        data["duration_ms"] = item.get("duration_ms")
-
-        artists = item.get("artists") or []
-        data["artists"] = [a.get("name") for a in artists if a.get("name")]
-        data["artist"] = ", ".join(data["artists"]) if data["artists"] else None
-
-        album = item.get("album") or {}
-        data["album_name"] = album.get("name")
-        data["album_uri"] = album.get("uri")
-
-        images = album.get("images") or []
-        data["image_url"] = images[0].get("url") if images else None
-        data["images"] = images 
-
-        ctx = player.get("context") or {}
-        data["context_type"] = ctx.get("type")
-        data["context_uri"] = ctx.get("uri")
-
-        dev = player.get("device") or {}
-        data["active_device_id"] = dev.get("id")
-        data["active_device_name"] = dev.get("name")
-        data["active_device_type"] = dev.get("type")
-        data["active_device_volume_percent"] = dev.get("volume_percent")
-        data["active_device_is_active"] = dev.get("is_active")
-        data["active_device_is_restricted"] = dev.get("is_restricted")
+        data["is_playing"] = player.is_playing
+        data["shuffle_state"] = player.shuffle_state
+        data["repeat_state"] = player.repeat_state
+        data["progress_ms"] = player.progress_ms
+        data["timestamp"] = player.timestamp
+
+        data["item_type"] = player.item_type
+        data["track_name"] = player.item_name
+        data["track_uri"] = player.item_uri
+        data["duration_ms"] = player.duration_ms
+
+        data["artists"] = list(player.artists)
+        data["artist"] = player.artist
+
+        data["album_name"] = player.album_name
+        data["album_uri"] = player.album_uri
+
+        data["image_url"] = player.image_url
+        data["local_image_url"] = (
+            runtime["artwork"].local_url(player.image_url) if player.image_url else None
+        )
+        data["images"] = [
+            {"url": img.url, "width": img.width, "height": img.height} for img in player.images
+        ]
+
+        data["context_type"] = player.context_type
+        data["context_uri"] = player.context_uri
+        data["also_in_playlists"] = [
+            {"id": p.id, "name": p.name}
+            for p in self.coordinator.playlists_for_track(player.item_uri)
+            if player.context_uri != f"spotify:playlist:{p.id}"
+        ]
+
+        data["active_device_id"] = player.device_id
+        data["active_device_name"] = player.device_name
+        data["active_device_type"] = player.device_type
+        data["active_device_volume_percent"] = player.device_volume_percent
+        data["active_device_is_active"] = player.device_is_active
+        data["active_device_is_restricted"] = player.device_is_restricted
+
+        upcoming = self.coordinator.upcoming
+        data["upcoming"] = (
+            {
+                "uri": upcoming.uri,
+                "name": upcoming.name,
+                "artists": list(upcoming.artists),
+                "album_name": upcoming.album_name,
+                "duration_ms": upcoming.duration_ms,
+                "image_url": upcoming.image_url,
+                "local_image_url": (
+                    runtime["artwork"].local_url(upcoming.image_url) if upcoming.image_url else None
+                ),
+            }
+            if upcoming
+            else None
+        )
+
+        if self.coordinator.liked_songs is not None:
+            data["liked_songs_count"] = len(self.coordinator.liked_songs)
 
         playlists = self.coordinator.data.playlists or []
         data["playlists"] = [{"id": p.id, "name": p.name} for p in playlists]
@@ -113,3 +156,51 @@ class SpotifyPlaybackSensor(CoordinatorEntity[SpotifyCoordinator], SensorEntity)
     @property
     def device_info(self):
         return spotify_device_info(self.entry.entry_id)
+
+
+class SpotifyApiStatusSensor(CoordinatorEntity[SpotifyCoordinator], SensorEntity):
+    _attr_has_entity_name = True
+    _attr_name = "Spotify API Status"
+    _attr_icon = "mdi:api"
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        entry: ConfigEntry,
+        coordinator: SpotifyCoordinator,
+    ) -> None:
+        super().__init__(coordinator)
+        self.hass = hass
+        self.entry = entry
+        self._attr_unique_id = f"{entry.entry_id}_api_status_sensor"
+
+    @property
+    def available(self) -> bool:
+        return True
+
+    @property
+    def native_value(self) -> str:
+        return self.coordinator.api.breaker.state
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        data = self.coordinator.api.breaker.as_dict()
+        data["last_update_success"] = self.coordinator.last_update_success
+        data["sections"] = {
+            name: {
+                "updated_at": (
+                    dt_util.utc_from_timestamp(status.updated_at).isoformat()
+                    if status.updated_at
+                    else None
+                ),
+                "error": status.error,
+                "failures": status.failures,
+            }
+            for name, status in self.coordinator.sections.items()
+        }
+        return data
+
+    @property
+    def device_info(self):
+        return spotify_device_info(self.entry.entry_id)
@@ -1,13 +1,39 @@
 from __future__ import annotations
 
+import json
+import os
+import re
+from dataclasses import asdict
+from datetime import datetime
+from functools import partial
+from typing import Any
+
 import voluptuous as vol
 
-from homeassistant.core import HomeAssistant, ServiceCall
+from homeassistant.core import HomeAssistant, ServiceCall, ServiceResponse, SupportsResponse
 from homeassistant.helpers import config_validation as cv
-from homeassistant.helpers import config_entry_oauth2_flow
-
-from .const import DOMAIN
+from homeassistant.util import dt as dt_util
+
+from .api import PLAY_URIS_LIMIT, PLAY_URIS_QUEUE_LIMIT, SpotifyApi
+from .const import (
+    CONF_SELECTED_PLAYLIST_IDS,
+    DOMAIN,
+    SAVED_TRACKS_LIMIT,
+    SERVICE_CANCEL_SCHEDULED_PLAYBACK,
+    SERVICE_DUMP_TRACE,
+    SERVICE_GET_LIKED_SONGS,
+    SERVICE_GET_PLAYLIST_TRACKS,
+    SERVICE_GET_PLAYLISTS,
+    SERVICE_GET_QUEUE,
+    SERVICE_GET_RECENTLY_PLAYED,
+    SERVICE_PLAY_TRACKS,
+    SERVICE_SCHEDULE_PLAYBACK,
+    SERVICE_VOLUME_RAMP,
+    TRACK_LIMIT_PER_PLAYLIST,
+)
 from .coordinator import SpotifyCoordinator
+from .scheduler import ScheduledPlayback
+from .planner import PlannedCall, plan_play_track
 
 
 SERVICE_PLAY_PLAYLIST = "play_playlist"
@@ -20,6 +46,40 @@ ATTR_PLAYLIST_NAME = "playlist_name"
 ATTR_TRACK_URI = "track_uri"
 ATTR_DEVICE_ID = "device_id"
 ATTR_PLAY_NOW = "play_now"
+ATTR_TRACK_URIS = "track_uris"
+ATTR_OFFSET = "offset"
+ATTR_POSITION_MS = "position_ms"
+ATTR_LIMIT = "limit"
+ATTR_FILENAME = "filename"
+ATTR_CLEAR = "clear"
+ATTR_AT = "at"
+ATTR_CONTEXT_URI = "context_uri"
+ATTR_VOLUME = "volume"
+ATTR_DURATION = "duration"
+
+_PAGE_SCHEMA = {
+    vol.Optional(ATTR_OFFSET, default=0): cv.positive_int,
+    vol.Optional(ATTR_LIMIT, default=50): vol.All(vol.Coerce(int), vol.Range(min=1, max=100)),
+}
+
+_OPEN_SPOTIFY_URL = re.compile(r"^https?://open\.spotify\.com/(?:intl-[\w-]+/)?(track|episode)/([A-Za-z0-9]+)")
+_SPOTIFY_URI = re.compile(r"^spotify:(track|episode):[A-Za-z0-9]+$")
+
+
+def _spotify_uri(value: str) -> str:
+    value = cv.string(value).strip()
+    if m := _OPEN_SPOTIFY_URL.match(value):
+        return f"spotify:{m.group(1)}:{m.group(2)}"
+    if not _SPOTIFY_URI.match(value):
+        raise vol.Invalid(f"Not a Spotify track or episode URI: {value}")
+    return value
+
+
+_TRACK_URIS = vol.All(
+    cv.ensure_list_csv,
+    [_spotify_uri],
+    vol.Length(max=PLAY_URIS_LIMIT + PLAY_URIS_QUEUE_LIMIT),
+)
 
 
 def _get_single_entry_id(hass: HomeAssistant) -> str:
@@ -30,18 +90,49 @@ def _get_single_entry_id(hass: HomeAssistant) -> str:
     return entries[0]
 
 
-async def _get_api_and_oauth(hass: HomeAssistant):
+async def _get_api(hass: HomeAssistant):
     entry_id = _get_single_entry_id(hass)
     rt = hass.data[DOMAIN][entry_id]
-    oauth: config_entry_oauth2_flow.OAuth2Session = rt["oauth"]
-    api = rt["api"]
+    api: SpotifyApi = rt["api"]
     coordinator: SpotifyCoordinator = rt["coordinator"]
-    return entry_id, rt, oauth, api, coordinator
+    return entry_id, rt, api, coordinator
+
+
+def _context_playlist_id(
+    coordinator: SpotifyCoordinator, track_uri: str, preferred: set[str]
+) -> str | None:
+    candidates = coordinator.playlists_for_track(track_uri)
+    if not candidates:
+        return None
+
+    # Stay in the playlist that is already playing, then prefer playlists
+    # the user picked in the options.
+    player = coordinator.data.player
+    if player and player.context_type == "playlist" and player.context_uri:
+        current = player.context_uri.rsplit(":", 1)[-1]
+        if any(pl.id == current for pl in candidates):
+            return current
+
+    return next((pl.id for pl in candidates if pl.id in preferred), candidates[0].id)
+
+
+def _page(items: list[Any], offset: int, total: int, source: str) -> ServiceResponse:
+    return {
+        "items": [asdict(item) for item in items],
+        "offset": offset,
+        "total": total,
+        "source": source,
+    }
+
+
+def _cached_page(call: ServiceCall, items: list[Any]) -> ServiceResponse:
+    offset, limit = call.data[ATTR_OFFSET], call.data[ATTR_LIMIT]
+    return _page(items[offset : offset + limit], offset, len(items), "cache")
 
 
 async def async_setup_services(hass: HomeAssistant) -> None:
     async def handle_play_playlist(call: ServiceCall) -> None:
-        _, rt, oauth, api, coordinator = await _get_api_and_oauth(hass)
+        _, rt, api, coordinator = await _get_api(hass)
 
         playlist_id = call.data.get(ATTR_PLAYLIST_ID)
         playlist_name = call.data.get(ATTR_PLAYLIST_NAME)
@@ -59,30 +150,39 @@ async def async_setup_services(hass: HomeAssistant) -> None:
                 raise vol.Invalid(f"Playlist not found by name: {playlist_name}")
             playlist_id = pl.id
 
-        await oauth.async_ensure_token_valid()
-        api.set_token(oauth.token["access_token"])
-
-        await api.start_playlist(device_id, playlist_id)
+        await coordinator.async_device_call(device_id, api.start_playlist, device_id, playlist_id)
         await coordinator.async_request_refresh()
 
     async def handle_play_track_in_playlist(call: ServiceCall) -> None:
-        _, rt, oauth, api, coordinator = await _get_api_and_oauth(hass)
+        entry_id, rt, api, coordinator = await _get_api(hass)
 
-        playlist_id = call.data[ATTR_PLAYLIST_ID]
         track_uri = call.data[ATTR_TRACK_URI]
         device_id = call.data.get(ATTR_DEVICE_ID) or rt.get("selected_device_id")
 
         if not device_id:
             raise vol.Invalid("No device_id provided and no selected_device_id set")
 
-        await oauth.async_ensure_token_valid()
-        api.set_token(oauth.token["access_token"])
-
-        await api.start_playlist_at_track(device_id, playlist_id, track_uri)
+        playlist_id = call.data.get(ATTR_PLAYLIST_ID)
+        if not playlist_id:
+            entry = hass.config_entries.async_get_entry(entry_id)
+            selected = (
+                set(entry.options.get(CONF_SELECTED_PLAYLIST_IDS) or entry.data.get(CONF_SELECTED_PLAYLIST_IDS) or [])
+                if entry
+                else set()
+            )
+            playlist_id = _context_playlist_id(coordinator, track_uri, selected)
+
+        if playlist_id:
+            await coordinator.async_device_call(
+                device_id, api.start_playlist_at_track, device_id, playlist_id, track_uri
+            )
+        else:
+            # Not in any cached playlist; play the track on its own.
+            await coordinator.async_device_call(device_id, api.start_playback, device_id, track_uri)
         await coordinator.async_request_refresh()
 
     async def handle_queue_track(call: ServiceCall) -> None:
-        _, rt, oauth, api, coordinator = await _get_api_and_oauth(hass)
+        _, rt, api, coordinator = await _get_api(hass)
 
         track_uri = call.data[ATTR_TRACK_URI]
         device_id = call.data.get(ATTR_DEVICE_ID) or rt.get("selected_device_id")
@@ -91,27 +191,174 @@ async def async_setup_services(hass: HomeAssistant) -> None:
         if not device_id:
             raise vol.Invalid("No device_id provided and no selected_device_id set")
 
-        await oauth.async_ensure_token_valid()
-        api.set_token(oauth.token["access_token"])
-
         player = coordinator.data.player
 
         if not player:
-            await api.start_playback(device_id, track_uri)
-            await coordinator.async_request_refresh()
-            return
+            plan = plan_play_track(player, device_id, track_uri, queue_mode=False)
+        elif play_now:
+            plan = plan_play_track(player, device_id, track_uri, queue_mode=True)
+        else:
+            plan = [PlannedCall("add_to_queue", (device_id, track_uri))]
+
+        await coordinator.async_execute_plan(device_id, plan)
+        await coordinator.async_request_refresh()
+
+    async def handle_play_tracks(call: ServiceCall) -> None:
+        _, rt, api, coordinator = await _get_api(hass)
 
-        await api.add_to_queue(device_id, track_uri)
+        track_uris = call.data[ATTR_TRACK_URIS]
+        device_id = call.data.get(ATTR_DEVICE_ID) or rt.get("selected_device_id")
 
-        if play_now:
-            await api.next_track(device_id)
+        if not device_id:
+            raise vol.Invalid("No device_id provided and no selected_device_id set")
 
+        if not track_uris:
+            raise vol.Invalid("Provide at least one track URI")
+
+        offset = call.data.get(ATTR_OFFSET)
+        if isinstance(offset, str) and offset not in track_uris:
+            raise vol.Invalid(f"Offset {offset} is not one of the track URIs")
+        if isinstance(offset, int) and offset >= len(track_uris):
+            raise vol.Invalid(f"Offset {offset} is past the end of the track list")
+
+        await coordinator.async_device_call(
+            device_id,
+            partial(
+                api.play_uris,
+                offset=offset,
+                position_ms=call.data.get(ATTR_POSITION_MS),
+            ),
+            device_id,
+            track_uris,
+            span="play_uris",
+        )
         await coordinator.async_request_refresh()
 
     async def handle_refresh_library(call: ServiceCall) -> None:
-        _, _, _, _, coordinator = await _get_api_and_oauth(hass)
+        _, _, _, coordinator = await _get_api(hass)
         await coordinator.async_refresh_library()
 
+    # Read services answer from the coordinator while the library is fresh
+    # and complete for the requested slice, and page the API otherwise.
+    async def handle_get_playlists(call: ServiceCall) -> ServiceResponse:
+        _, _, api, coordinator = await _get_api(hass)
+        if coordinator.library_fresh:
+            return _cached_page(call, coordinator.data.playlists)
+
+        offset = call.data[ATTR_OFFSET]
+        playlists, total = await api.get_playlists_page(offset, call.data[ATTR_LIMIT])
+        return _page(playlists, offset, total, "api")
+
+    async def handle_get_playlist_tracks(call: ServiceCall) -> ServiceResponse:
+        _, _, api, coordinator = await _get_api(hass)
+        playlist_id = call.data[ATTR_PLAYLIST_ID]
+        cached = coordinator.data.playlist_tracks.get(playlist_id)
+        # The cache is capped, so only a shorter list is known to be complete.
+        if coordinator.library_fresh and cached is not None and len(cached) < TRACK_LIMIT_PER_PLAYLIST:
+            return _cached_page(call, cached)
+
+        offset = call.data[ATTR_OFFSET]
+        tracks, total = await api.get_playlist_tracks_page(playlist_id, offset, call.data[ATTR_LIMIT])
+        return _page(tracks, offset, total, "api")
+
+    async def handle_get_liked_songs(call: ServiceCall) -> ServiceResponse:
+        _, _, api, coordinator = await _get_api(hass)
+        if coordinator.library_fresh:
+            if coordinator.liked_songs is not None:
+                return _cached_page(call, coordinator.liked_songs)
+            if len(coordinator.data.saved_tracks) < SAVED_TRACKS_LIMIT:
+                return _cached_page(call, coordinator.data.saved_tracks)
+
+        offset = call.data[ATTR_OFFSET]
+        tracks, total = await api.get_saved_tracks_page(offset, call.data[ATTR_LIMIT])
+        return _page(tracks, offset, total, "api")
+
+    async def handle_get_recently_played(call: ServiceCall) -> ServiceResponse:
+        _, _, api, coordinator = await _get_api(hass)
+        # Refreshed on every poll once the library has loaded.
+        if coordinator.library_updated_at is not None and coordinator.last_update_success:
+            return _cached_page(call, coordinator.data.recent_tracks)
+
+        # The endpoint is cursor based and returns at most 50 items.
+        items = await api.get_recently_played(limit=50)
+        offset, limit = call.data[ATTR_OFFSET], call.data[ATTR_LIMIT]
+        return _page(items[offset : offset + limit], offset, len(items), "api")
+
+    async def handle_get_queue(call: ServiceCall) -> ServiceResponse:
+        _, _, api, _ = await _get_api(hass)
+        current, queue = await api.get_queue()
+        offset, limit = call.data[ATTR_OFFSET], call.data[ATTR_LIMIT]
+        response = _page(queue[offset : offset + limit], offset, len(queue), "api")
+        response["currently_playing"] = asdict(current) if current else None
+        return response
+
+    async def handle_dump_trace(call: ServiceCall) -> ServiceResponse:
+        _, _, api, _ = await _get_api(hass)
+        trace = api.tracer.export()
+
+        if filename := call.data.get(ATTR_FILENAME):
+            # Traces go to a directory the integration owns; only the
+            # file name is taken from the call.
+            name = os.path.basename(filename)
+            if name in ("", ".", ".."):
+                raise vol.Invalid(f"Not a file name: {filename}")
+            directory = hass.config.path(".cache", DOMAIN, "traces")
+            path = os.path.join(directory, name)
+
+            def _write() -> None:
+                os.makedirs(directory, exist_ok=True)
+                with open(path, "w", encoding="utf-8") as f:
+                    json.dump(trace, f)
+
+            await hass.async_add_executor_job(_write)
+
+        if call.data[ATTR_CLEAR]:
+            api.tracer.clear()
+        return trace if call.return_response else None
+
+    async def handle_schedule_playback(call: ServiceCall) -> None:
+        _, rt, _, _ = await _get_api(hass)
+
+        device_id = call.data.get(ATTR_DEVICE_ID) or rt.get("selected_device_id")
+        if not device_id:
+            raise vol.Invalid("No device_id provided and no selected_device_id set")
+
+        at: datetime = call.data[ATTR_AT]
+        if at.tzinfo is None:
+            at = at.replace(tzinfo=dt_util.get_default_time_zone())
+        at = dt_util.as_utc(at)
+        if at <= dt_util.utcnow():
+            raise vol.Invalid(f"{at.isoformat()} is in the past")
+
+        context_uri = call.data.get(ATTR_CONTEXT_URI)
+        if playlist_id := call.data.get(ATTR_PLAYLIST_ID):
+            context_uri = f"spotify:playlist:{playlist_id}"
+
+        rt["scheduler"].async_schedule(
+            ScheduledPlayback(
+                at=at,
+                device_id=device_id,
+                context_uri=context_uri,
+                uris=call.data.get(ATTR_TRACK_URIS),
+                volume=call.data.get(ATTR_VOLUME),
+            )
+        )
+
+    async def handle_cancel_scheduled_playback(call: ServiceCall) -> None:
+        _, rt, _, _ = await _get_api(hass)
+        rt["scheduler"].async_cancel()
+
+    async def handle_volume_ramp(call: ServiceCall) -> None:
+        _, rt, _, coordinator = await _get_api(hass)
+
+        player = coordinator.data.player
+        device_id = (
+            call.data.get(ATTR_DEVICE_ID)
+            or (player.device_id if player else None)
+            or rt.get("selected_device_id")
+        )
+        rt["volume"].async_ramp(call.data[ATTR_VOLUME], call.data[ATTR_DURATION], device_id)
+
     hass.services.async_register(
         DOMAIN,
         SERVICE_PLAY_PLAYLIST,
@@ -131,7 +378,7 @@ async def async_setup_services(hass: HomeAssistant) -> None:
         handle_play_track_in_playlist,
         schema=vol.Schema(
             {
-                vol.Required(ATTR_PLAYLIST_ID): cv.string,
+                vol.Optional(ATTR_PLAYLIST_ID): cv.string,
                 vol.Required(ATTR_TRACK_URI): cv.string,
                 vol.Optional(ATTR_DEVICE_ID): cv.string,
             }
@@ -151,9 +398,114 @@ async def async_setup_services(hass: HomeAssistant) -> None:
         ),
     )
 
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_PLAY_TRACKS,
+        handle_play_tracks,
+        schema=vol.Schema(
+            {
+                vol.Required(ATTR_TRACK_URIS): _TRACK_URIS,
+                vol.Optional(ATTR_OFFSET): vol.Any(cv.positive_int, _spotify_uri),
+                vol.Optional(ATTR_POSITION_MS): cv.positive_int,
+                vol.Optional(ATTR_DEVICE_ID): cv.string,
+            }
+        ),
+    )
+
     hass.services.async_register(
         DOMAIN,
         SERVICE_REFRESH_LIBRARY,
         handle_refresh_library,
         schema=vol.Schema({}),
     )
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_GET_PLAYLISTS,
+        handle_get_playlists,
+        schema=vol.Schema(_PAGE_SCHEMA),
+        supports_response=SupportsResponse.ONLY,
+    )
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_GET_PLAYLIST_TRACKS,
+        handle_get_playlist_tracks,
+        schema=vol.Schema({vol.Required(ATTR_PLAYLIST_ID): cv.string, **_PAGE_SCHEMA}),
+        supports_response=SupportsResponse.ONLY,
+    )
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_GET_LIKED_SONGS,
+        handle_get_liked_songs,
+        schema=vol.Schema(_PAGE_SCHEMA),
+        supports_response=SupportsResponse.ONLY,
+    )
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_GET_RECENTLY_PLAYED,
+        handle_get_recently_played,
+        schema=vol.Schema(_PAGE_SCHEMA),
+        supports_response=SupportsResponse.ONLY,
+    )
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_GET_QUEUE,
+        handle_get_queue,
+        schema=vol.Schema(_PAGE_SCHEMA),
+        supports_response=SupportsResponse.ONLY,
+    )
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_DUMP_TRACE,
+        handle_dump_trace,
+        schema=vol.Schema(
+            {
+                vol.Optional(ATTR_FILENAME): cv.string,
+                vol.Optional(ATTR_CLEAR, default=False): cv.boolean,
+            }
+        ),
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_SCHEDULE_PLAYBACK,
+        handle_schedule_playback,
+        schema=vol.Schema(
+            {
+                vol.Required(ATTR_AT): cv.datetime,
+                vol.Optional(ATTR_DEVICE_ID): cv.string,
+                vol.Exclusive(ATTR_PLAYLIST_ID, "what"): cv.string,
+                vol.Exclusive(ATTR_CONTEXT_URI, "what"): cv.string,
+                vol.Exclusive(ATTR_TRACK_URIS, "what"): _TRACK_URIS,
+                vol.Optional(ATTR_VOLUME): vol.All(vol.Coerce(int), vol.Range(min=0, max=100)),
+            }
+        ),
+    )
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_CANCEL_SCHEDULED_PLAYBACK,
+        handle_cancel_scheduled_playback,
+        schema=vol.Schema({}),
+    )
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_VOLUME_RAMP,
+        handle_volume_ramp,
+        schema=vol.Schema(
+            {
+                vol.Required(ATTR_VOLUME): vol.All(vol.Coerce(int), vol.Range(min=0, max=100)),
+                vol.Optional(ATTR_DURATION, default=10): vol.All(
+                    vol.Coerce(float), vol.Range(min=0, max=3600)
+                ),
+                vol.Optional(ATTR_DEVICE_ID): cv.string,
+            }
+        ),
+    )
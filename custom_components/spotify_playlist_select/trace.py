@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import asyncio
+import os
+import time
+from collections import deque
+from collections.abc import Iterator
+from contextlib import AbstractContextManager, contextmanager, nullcontext
+from contextvars import ContextVar
+from typing import Any
+
+from .const import TRACE_BUFFER_SIZE
+
+_current_span: ContextVar[dict[str, Any] | None] = ContextVar("spotify_trace_span", default=None)
+_DISABLED: AbstractContextManager[None] = nullcontext()
+
+
+def _tid() -> int:
+    try:
+        task = asyncio.current_task()
+    except RuntimeError:
+        task = None
+    # Chrome trace rows are threads; one row per asyncio task keeps
+    # concurrent requests from stacking on top of each other.
+    return id(task) & 0xFFFFFF if task else 0
+
+
+class Tracer:
+    def __init__(self, enabled: bool = False, capacity: int = TRACE_BUFFER_SIZE) -> None:
+        self.enabled = enabled
+        self._events: deque[dict[str, Any]] = deque(maxlen=capacity)
+        self._pid = os.getpid()
+
+    def span(self, name: str, cat: str = "phase", **args: Any) -> AbstractContextManager[Any]:
+        if not self.enabled:
+            return _DISABLED
+        return self._span(name, cat, args)
+
+    @contextmanager
+    def _span(self, name: str, cat: str, args: dict[str, Any]) -> Iterator[dict[str, Any]]:
+        token = _current_span.set(args)
+        start = time.perf_counter_ns()
+        try:
+            yield args
+        except BaseException as err:
+            args["error"] = type(err).__name__
+            raise
+        finally:
+            end = time.perf_counter_ns()
+            _current_span.reset(token)
+            self._events.append(
+                {
+                    "name": name,
+                    "cat": cat,
+                    "ph": "X",
+                    "ts": start // 1000,
+                    "dur": (end - start) // 1000,
+                    "pid": self._pid,
+                    "tid": _tid(),
+                    "args": args,
+                }
+            )
+
+    def annotate(self, **kwargs: Any) -> None:
+        if not self.enabled:
+            return
+        args = _current_span.get()
+        if args is not None:
+            args.update(kwargs)
+
+    def clear(self) -> None:
+        self._events.clear()
+
+    def export(self) -> dict[str, Any]:
+        return {
+            "traceEvents": sorted(self._events, key=lambda ev: ev["ts"]),
+            "displayTimeUnit": "ms",
+            "otherData": {"enabled": self.enabled, "capacity": self._events.maxlen},
+        }
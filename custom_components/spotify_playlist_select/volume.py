@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import math
+from time import monotonic
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+
+from .const import VOLUME_MIN_INTERVAL, VOLUME_OPTIMISTIC_HOLD
+from .coordinator import SpotifyCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class VolumeController:
+    def __init__(self, hass: HomeAssistant, coordinator: SpotifyCoordinator) -> None:
+        self.hass = hass
+        self.coordinator = coordinator
+        self._target: int | None = None
+        self._device_id: str | None = None
+        self._sent: tuple[str | None, int] | None = None
+        self._last_sent_at = 0.0
+        self._hold_until = 0.0
+        self._sender: asyncio.Task[None] | None = None
+        self._ramp: asyncio.Task[None] | None = None
+        # Only the media player shows the optimistic volume; notifying it
+        # directly avoids writing every coordinator entity per slider tick.
+        self._listeners: list[CALLBACK_TYPE] = []
+
+    @callback
+    def async_add_listener(self, update_callback: CALLBACK_TYPE) -> CALLBACK_TYPE:
+        self._listeners.append(update_callback)
+
+        @callback
+        def remove_listener() -> None:
+            self._listeners.remove(update_callback)
+
+        return remove_listener
+
+    @callback
+    def _async_notify(self) -> None:
+        for update_callback in list(self._listeners):
+            update_callback()
+
+    @property
+    def volume(self) -> int | None:
+        # Report the requested volume until Spotify has had time to reflect
+        # it in the player state, so sliders don't jump back mid-drag.
+        if self._target is None:
+            return None
+        if self._sender is not None and not self._sender.done():
+            return self._target
+        return self._target if monotonic() < self._hold_until else None
+
+    def current_volume(self) -> int | None:
+        if (volume := self.volume) is not None:
+            return volume
+        player = self.coordinator.data.player if self.coordinator.data else None
+        return player.device_volume_percent if player else None
+
+    @callback
+    def async_set(self, volume: int, device_id: str | None, cancel_ramp: bool = True) -> None:
+        if cancel_ramp:
+            self._cancel_ramp()
+        self._target = max(0, min(100, int(volume)))
+        self._device_id = device_id
+        self._hold_until = monotonic() + VOLUME_OPTIMISTIC_HOLD
+        self._async_notify()
+
+        if self._sender is None or self._sender.done():
+            self._sender = self.hass.async_create_task(self._async_send())
+
+    async def _async_send(self) -> None:
+        # Only the newest target is sent; requests in between are
+        # coalesced and the rate is capped at one per VOLUME_MIN_INTERVAL.
+        # _sent only dedupes within this burst: once the loop exits the
+        # device may have been changed elsewhere, so the same value must be
+        # sent again when asked for.
+        api = self.coordinator.api
+        try:
+            while self._target is not None:
+                wait = self._last_sent_at + VOLUME_MIN_INTERVAL - monotonic()
+                if wait > 0:
+                    await asyncio.sleep(wait)
+
+                request = (self._device_id, self._target)
+                if request == self._sent:
+                    return
+
+                self._last_sent_at = monotonic()
+                try:
+                    await self.coordinator.async_device_call(
+                        request[0], api.set_volume, request[1], request[0]
+                    )
+                except Exception as err:
+                    _LOGGER.warning("Setting Spotify volume failed: %s", err)
+                    self._target = None
+                    self._async_notify()
+                    return
+
+                self._sent = request
+                self._hold_until = monotonic() + VOLUME_OPTIMISTIC_HOLD
+        finally:
+            self._sent = None
+
+    @callback
+    def async_ramp(self, volume: int, duration: float, device_id: str | None) -> None:
+        self._cancel_ramp()
+        self._ramp = self.hass.async_create_task(self._async_ramp(volume, duration, device_id))
+
+    async def _async_ramp(self, volume: int, duration: float, device_id: str | None) -> None:
+        start = self.current_volume()
+        if start is None or duration <= 0:
+            self.async_set(volume, device_id, cancel_ramp=False)
+            return
+
+        steps = max(1, min(abs(volume - start), math.ceil(duration / VOLUME_MIN_INTERVAL)))
+        interval = duration / steps
+        began = monotonic()
+        for step in range(1, steps + 1):
+            self.async_set(round(start + (volume - start) * step / steps), device_id, cancel_ramp=False)
+            if step < steps:
+                await asyncio.sleep(max(0.0, began + interval * step - monotonic()))
+
+    def _cancel_ramp(self) -> None:
+        if self._ramp is not None and not self._ramp.done():
+            self._ramp.cancel()
+        self._ramp = None
+
+    @callback
+    def async_shutdown(self) -> None:
+        self._cancel_ramp()
+        if self._sender is not None and not self._sender.done():
+            self._sender.cancel()